@@ -1,31 +1,180 @@
 #!/usr/bin/env python3
 """Auto-generated application with full functionality."""
 
+import csv
+import io
 import sys
 import json
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to pure Python
+    np = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is used instead
+    orjson = None
+
+try:
+    from _aggregator import group_by as _compiled_group_by
+except ImportError:  # Cython extension not built; use the Python group_by
+    _compiled_group_by = None
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; plain NumPy reductions are used
+    njit = None
+
+
+def _orjson_dumps(obj: Any) -> Optional[bytes]:
+    """Indented UTF-8 JSON from orjson, or None if orjson is missing or rejects obj.
+    
+    Not byte-identical to json.dumps(obj, indent=2): non-ASCII text is
+    written as UTF-8 instead of \\u escapes and floats use orjson's notation
+    (1e16, 1e-7 and 0.00001 for 1e+16, 1e-07 and 1e-05), which parse back
+    to the same values, while NaN and infinities become null. Ints beyond
+    64 bits raise JSONEncodeError and go through the stdlib encoder.
+    """
+    if orjson is None:
+        return None
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        return None
+
+def _dumps(obj: Any) -> str:
+    """Serialize obj as indented JSON, through orjson when it can encode obj."""
+    data = _orjson_dumps(obj)
+    if data is not None:
+        return data.decode()
+    return json.dumps(obj, indent=2)
+
+# Largest magnitude up to which every integer is exact in a float64
+_FLOAT_EXACT = 1 << 53
+
+# Column extractors generated per schema (tuple of field names)
+_SPECIALIZED: Dict[Tuple[str, ...], Callable[[List[Dict]], Tuple[List[Any], ...]]] = {}
+
+def _schema_extractor(keys: Tuple[str, ...]) -> Callable[[List[Dict]], Tuple[List[Any], ...]]:
+    """Return a generated function that pulls every key's column out of the rows.
+    
+    The field names are inlined as constant subscripts, so the generated
+    comprehensions skip the per-row .get() call and isinstance() guard.
+    """
+    extractor = _SPECIALIZED.get(keys)
+    if extractor is None:
+        columns = "".join(f"[d[{key!r}] for d in data], " for key in keys)
+        source = f"def extract(data):\n    return ({columns})\n"
+        namespace = {}
+        exec(compile(source, f"<schema {keys!r}>", "exec"), namespace)
+        extractor = _SPECIALIZED[keys] = namespace["extract"]
+    return extractor
+
+def _schema_keys(data: List[Dict]) -> List[str]:
+    """Return the field names of the first record, or [] if there is none."""
+    if not isinstance(data, list) or not data or not isinstance(data[0], dict):
+        return []
+    return list(data[0].keys())
+
+def _to_columns(data: List[Dict], keys: List[str]) -> Dict[str, Any]:
+    """Transpose row dicts into one NumPy array per key (empty without NumPy)."""
+    if np is None or not keys:
+        return {}
+    
+    columns = None
+    if all(isinstance(key, str) for key in keys):
+        try:
+            columns = _schema_extractor(tuple(keys))(data)
+        except (KeyError, TypeError):
+            pass  # Ragged rows or non-dict items; use the tolerant path
+    if columns is None:
+        columns = [[item.get(key) if isinstance(item, dict) else None for item in data] for key in keys]
+    
+    return {key: _to_column(values) for key, values in zip(keys, columns)}
+
+def _to_column(values: List[Any]) -> Any:
+    """Store values as int64 or float64 when that is exact, else as an object array.
+    
+    All-int columns stay int64, since float64 would merge integers above
+    2**53. Ints that don't fit, or that share a column with floats and
+    exceed 2**53, keep the Python objects.
+    """
+    if all(isinstance(v, int) for v in values):
+        try:
+            return np.asarray(values, dtype=np.int64)
+        except OverflowError:
+            pass
+    elif all(isinstance(v, (int, float)) for v in values):
+        if all(isinstance(v, float) or -_FLOAT_EXACT <= v <= _FLOAT_EXACT for v in values):
+            return np.asarray(values, dtype=np.float64)
+    return np.fromiter(values, dtype=object, count=len(values))
+
+def _numeric_values(values: Iterable[Any]) -> List[Any]:
+    """Keep only the int/float entries, reading each value once."""
+    return [v for v in values if isinstance(v, (int, float))]
+
+def _numeric_column(cols: Dict[str, Any], key: str) -> Optional[Any]:
+    """Return the int64/float64 column for key, or None if it is not fully numeric."""
+    col = cols.get(key)
+    if col is not None and col.dtype.kind in "if":
+        return col
+    return None
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _stats_kernel(a):
+        """Single pass over a: sum, min, max and Welford mean/M2."""
+        s = 0.0
+        mn = a[0]
+        mx = a[0]
+        mean = 0.0
+        m2 = 0.0
+        for i in range(a.shape[0]):
+            x = a[i]
+            s += x
+            if x < mn:
+                mn = x
+            if x > mx:
+                mx = x
+            delta = x - mean
+            mean += delta / (i + 1)
+            m2 += delta * (x - mean)
+        return s, mn, mx, mean, m2
+else:
+    _stats_kernel = None
 
 
 class Logger:
     """Logging utility for tracking operations."""
     
-    def __init__(self):
-        """Initialize logger."""
-        self.logs = []
+    __slots__ = ("logs", "_cwd")
+    
+    def __init__(self, maxlen: Optional[int] = None):
+        """Initialize logger; maxlen keeps only the most recent entries."""
+        self.logs = deque(maxlen=maxlen)
+        self._cwd = str(Path.cwd())  # resolved once instead of a getcwd() per entry
     
     def log(self, level: str, message: str) -> None:
         """Log a message."""
-        entry = {"level": level, "message": message, "timestamp": str(Path.cwd())}
+        entry = {"level": level, "message": message, "timestamp": self._cwd}
         self.logs.append(entry)
     
     def get_logs(self) -> List[Dict]:
         """Get all logs."""
-        return self.logs
+        return list(self.logs)
 
 class DataValidator:
     """Validate data structure and types."""
     
+    __slots__ = ("data", "errors")
+    
     def __init__(self, data: List[Dict]):
         """Initialize validator."""
         self.data = data
@@ -54,9 +203,14 @@ class DataValidator:
 class StatisticalAnalyzer:
     """Perform statistical analysis on numeric data."""
     
-    def __init__(self, data: List[Dict]):
+    __slots__ = ("data", "cols", "keys")
+    
+    def __init__(self, data: List[Dict], cols: Optional[Dict[str, Any]] = None,
+                 keys: Optional[List[str]] = None):
         """Initialize analyzer."""
         self.data = data
+        self.cols = cols or {}
+        self.keys = keys
     
     def compute_statistics(self) -> Dict[str, Dict[str, float]]:
         """Compute comprehensive statistics."""
@@ -64,10 +218,17 @@ class StatisticalAnalyzer:
             return {}
         
         stats = {}
-        keys = self.data[0].keys()
+        keys = self.keys if self.keys is not None else self.data[0].keys()
         
         for key in keys:
-            values = [item.get(key) for item in self.data if isinstance(item.get(key), (int, float))]
+            col = _numeric_column(self.cols, key)
+            if col is not None:
+                stats[key] = self._calc_key_stats(col)
+                continue
+            
+            # Reuse an already-extracted object column before touching the rows
+            raw = self.cols[key].tolist() if key in self.cols else (item.get(key) for item in self.data)
+            values = _numeric_values(raw)
             if values:
                 stats[key] = self._calc_key_stats(values)
         
@@ -75,76 +236,181 @@ class StatisticalAnalyzer:
     
     def _calc_key_stats(self, values: List[float]) -> Dict[str, float]:
         """Calculate statistics for a single key."""
+        if np is not None:
+            arr = np.asarray(values, dtype=np.float64)
+            n = arr.size
+            median = float(np.partition(arr, n // 2)[n // 2])
+            if _stats_kernel is not None:
+                total, lo, hi, mean, _ = _stats_kernel(arr)
+                return {
+                    "count": n,
+                    "sum": float(total),
+                    "mean": float(mean),
+                    "median": median,
+                    "min": float(lo),
+                    "max": float(hi),
+                    "range": float(hi - lo)
+                }
+            return {
+                "count": n,
+                "sum": float(arr.sum()),
+                "mean": float(arr.mean()),
+                "median": median,
+                "min": float(arr.min()),
+                "max": float(arr.max()),
+                "range": float(np.ptp(arr))
+            }
+        
+        # Without NumPy there is no C selection routine (heapq.nsmallest is
+        # slower than timsort at k = n/2), so sort once and read the median,
+        # min and max from it instead of making separate passes.
         sorted_vals = sorted(values)
         n = len(values)
+        total = sum(values)
+        lo = sorted_vals[0]
+        hi = sorted_vals[-1]
         
         return {
             "count": n,
-            "sum": sum(values),
-            "mean": sum(values) / n,
+            "sum": total,
+            "mean": total / n,
             "median": sorted_vals[n // 2],
-            "min": min(values),
-            "max": max(values),
-            "range": max(values) - min(values)
+            "min": lo,
+            "max": hi,
+            "range": hi - lo
         }
 
 class DataFilter:
     """Filter data based on conditions."""
     
-    def __init__(self, data: List[Dict]):
+    __slots__ = ("data", "cols")
+    
+    def __init__(self, data: List[Dict], cols: Optional[Dict[str, Any]] = None):
         """Initialize filter."""
         self.data = data
+        self.cols = cols or {}
+    
+    def _col(self, key: str) -> Optional[Any]:
+        """Return the column for key, building and caching it on first use."""
+        if np is None:
+            return None
+        if key not in self.cols:
+            self.cols[key] = _to_column([item.get(key) for item in self.data])
+        return self.cols[key]
     
     def filter_by_key_value(self, key: str, value: Any) -> List[Dict]:
         """Filter data by key-value pair."""
+        col = self._col(key)
+        # An int64 column against a float would compare as float64
+        if col is not None and (value is None or isinstance(value, (str, int, float))) \
+                and not (col.dtype == np.int64 and isinstance(value, float)):
+            return [self.data[i] for i in np.flatnonzero(col == value)]
+        
         return [item for item in self.data if item.get(key) == value]
     
     def filter_by_range(self, key: str, min_val: float, max_val: float) -> List[Dict]:
         """Filter numeric data by range."""
+        col = self._col(key)
+        if col is not None and (col.dtype == np.float64 or (
+                col.dtype == np.int64 and not isinstance(min_val, float) and not isinstance(max_val, float))):
+            mask = (col >= min_val) & (col <= max_val)
+            return [self.data[i] for i in np.flatnonzero(mask)]
+        
         return [item for item in self.data 
                 if min_val <= item.get(key, 0) <= max_val]
 
 class DataSorter:
     """Sort data by various criteria."""
     
-    def __init__(self, data: List[Dict]):
+    __slots__ = ("data", "cols")
+    
+    def __init__(self, data: List[Dict], cols: Optional[Dict[str, Any]] = None):
         """Initialize sorter."""
         self.data = data
+        self.cols = cols or {}
     
     def sort_by_key(self, key: str, reverse: bool = False) -> List[Dict]:
         """Sort by a specific key."""
-        return sorted(self.data, key=lambda x: x.get(key, 0), reverse=reverse)
+        col = _numeric_column(self.cols, key)
+        if col is not None:
+            # Negate rather than reverse so ties keep their original order;
+            # ~ is the int64 negation that can't overflow at -2**63
+            if reverse:
+                col = ~col if col.dtype == np.int64 else -col
+            order = np.argsort(col, kind="stable")
+            return [self.data[i] for i in order]
+        
+        return self._sorted(self.data, key, reverse)
     
     def sort_by_multiple_keys(self, keys: List[str]) -> List[Dict]:
-        """Sort by multiple keys."""
+        """Sort by multiple keys, returning a new list."""
+        cols = [_numeric_column(self.cols, key) for key in keys]
+        if cols and all(col is not None for col in cols):
+            # lexsort treats the last column as the primary key
+            order = np.lexsort(cols[::-1])
+            return [self.data[i] for i in order]
+        
+        result = self.data
         for key in reversed(keys):
-            self.data = sorted(self.data, key=lambda x: x.get(key, 0))
-        return self.data
+            result = self._sorted(result, key)
+        return result
+    
+    @staticmethod
+    def _sorted(rows: List[Dict], key: str, reverse: bool = False) -> List[Dict]:
+        """Stable sort on key, treating a missing key as 0."""
+        try:
+            return sorted(rows, key=itemgetter(key), reverse=reverse)
+        except KeyError:
+            return sorted(rows, key=lambda x: x.get(key, 0), reverse=reverse)
 
 class DataAggregator:
     """Aggregate data into summaries."""
     
-    def __init__(self, data: List[Dict]):
+    __slots__ = ("data", "cols")
+    
+    def __init__(self, data: List[Dict], cols: Optional[Dict[str, Any]] = None):
         """Initialize aggregator."""
         self.data = data
+        self.cols = cols or {}
     
     def group_by(self, key: str) -> Dict[str, List[Dict]]:
         """Group data by a key."""
-        groups = {}
+        if _compiled_group_by is not None and isinstance(self.data, list):
+            return _compiled_group_by(self.data, key)
+        
+        groups = defaultdict(list)
         for item in self.data:
-            group_key = item.get(key)
-            if group_key not in groups:
-                groups[group_key] = []
-            groups[group_key].append(item)
-        return groups
+            groups[item.get(key)].append(item)
+        return dict(groups)
     
     def aggregate_numeric(self, group_key: str, numeric_key: str) -> Dict:
         """Aggregate numeric values by group."""
+        values = _numeric_column(self.cols, numeric_key)
+        if values is not None and group_key in self.cols:
+            try:
+                uniq, first, codes = np.unique(self.cols[group_key], return_index=True, return_inverse=True)
+            except TypeError:
+                uniq = None  # Unorderable mixed group keys; use the dict path
+            if uniq is not None:
+                sums = np.bincount(codes, weights=values, minlength=uniq.size)
+                counts = np.bincount(codes, minlength=uniq.size)
+                aggregated = {}
+                # Report groups in first-seen order with their original key objects
+                for g in np.argsort(first, kind="stable"):
+                    count = int(counts[g])
+                    total = float(sums[g])
+                    aggregated[self.data[first[g]].get(group_key)] = {
+                        "count": count,
+                        "sum": total,
+                        "avg": total / count
+                    }
+                return aggregated
+        
         groups = self.group_by(group_key)
         aggregated = {}
         
         for group, items in groups.items():
-            values = [item.get(numeric_key) for item in items if isinstance(item.get(numeric_key), (int, float))]
+            values = _numeric_values(item.get(numeric_key) for item in items)
             if values:
                 aggregated[group] = {
                     "count": len(values),
@@ -157,41 +423,72 @@ class DataAggregator:
 class DataExporter:
     """Export data in various formats."""
     
-    def __init__(self, data: List[Dict]):
+    __slots__ = ("data", "keys")
+    
+    def __init__(self, data: List[Dict], keys: Optional[List[str]] = None):
         """Initialize exporter."""
         self.data = data
+        self.keys = keys
     
     def to_json(self) -> str:
         """Export as JSON."""
-        return json.dumps(self.data, indent=2)
+        return _dumps(self.data)
+    
+    def to_json_bytes(self, fp: Optional[BinaryIO] = None) -> Optional[bytes]:
+        """Export as UTF-8 JSON bytes, or write them to a binary file if given.
+        
+        With orjson installed these are orjson's bytes, which differ from
+        json.dumps(indent=2).encode() as described in _orjson_dumps.
+        """
+        data = _orjson_dumps(self.data)
+        if data is not None:
+            if fp is None:
+                return data
+            fp.write(data)
+            return None
+        
+        if fp is None:
+            return json.dumps(self.data, indent=2).encode()
+        # Stream through a text wrapper so no full-size str is built
+        text = io.TextIOWrapper(fp, encoding="utf-8")
+        json.dump(self.data, text, indent=2)
+        text.detach()
+        return None
     
     def to_csv_string(self) -> str:
         """Export as CSV string."""
         if not self.data:
             return ""
         
-        keys = list(self.data[0].keys())
-        lines = [",".join(keys)]
+        keys = self.keys if self.keys is not None else list(self.data[0].keys())
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(keys)
+        # str() as before, so None is still written as "None" (csv would
+        # leave the cell empty)
+        writer.writerows([str(item.get(k, "")) for k in keys] for item in self.data)
         
-        for item in self.data:
-            values = [str(item.get(k, "")) for k in keys]
-            lines.append(",".join(values))
-        
-        return "\n".join(lines)
+        # Drop the final terminator to match the previous join-based output
+        return buf.getvalue()[:-1]
 
 class DataProcessor:
     """Main processor coordinating all operations."""
     
+    __slots__ = ("data", "keys", "cols", "logger", "validator", "analyzer", "filter",
+                 "sorter", "aggregator", "exporter", "results")
+    
     def __init__(self, data: List[Dict]):
         """Initialize processor."""
         self.data = data
+        self.keys = _schema_keys(data)
+        self.cols = _to_columns(data, self.keys)
         self.logger = Logger()
         self.validator = DataValidator(data)
-        self.analyzer = StatisticalAnalyzer(data)
-        self.filter = DataFilter(data)
-        self.sorter = DataSorter(data.copy() if data else [])
-        self.aggregator = DataAggregator(data)
-        self.exporter = DataExporter(data)
+        self.analyzer = StatisticalAnalyzer(data, self.cols, self.keys)
+        self.filter = DataFilter(data, self.cols)
+        self.sorter = DataSorter(data if data else [], self.cols)
+        self.aggregator = DataAggregator(data, self.cols)
+        self.exporter = DataExporter(data, self.keys)
         self.results = {}
     
     def process_complete(self) -> Dict[str, Any]:
@@ -206,7 +503,7 @@ class DataProcessor:
         
         self.results = {
             "total_records": len(self.data),
-            "fields": list(self.data[0].keys()) if self.data else [],
+            "fields": list(self.keys),
             "statistics": self.analyzer.compute_statistics(),
             "sample_record": self.data[0] if self.data else None
         }
@@ -220,6 +517,18 @@ class DataProcessor:
             return self.exporter.to_csv_string()
         return self.exporter.to_json()
 
+def _process_one(data: List[Dict]) -> Dict[str, Any]:
+    """Run the full pipeline on one dataset (picklable worker entry point)."""
+    return DataProcessor(data).process_complete()
+
+def process_many(datasets: List[List[Dict]], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Process independent datasets in parallel, preserving input order."""
+    if len(datasets) <= 1:
+        return [_process_one(data) for data in datasets]
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_process_one, datasets))
+
 def main_app():
     """Main application logic."""
     sample_data = [
@@ -242,7 +551,7 @@ def main_app():
         print(f"Fields: {results['fields']}")
         
         print("\nStatistics:")
-        print(json.dumps(results["statistics"], indent=2))
+        print(_dumps(results["statistics"]))
         
         print("\nFiltered Data (value > 120):")
         filtered = processor.filter.filter_by_range("value", 120, 500)
@@ -251,7 +560,7 @@ def main_app():
         
         print("\nAggregated by Category:")
         agg = processor.aggregator.aggregate_numeric("category", "value")
-        print(json.dumps(agg, indent=2))
+        print(_dumps(agg))
         
         print("\nSorted by Score (descending):")
         sorted_data = processor.sorter.sort_by_key("score", reverse=True)
@@ -0,0 +1,23 @@
+# cython: language_level=3
+"""Compiled group_by for EXAMPLE_EXPANDED_GENERATED_APP.DataAggregator.
+
+Build in place with:  cythonize -i _aggregator.pyx
+The application falls back to its pure-Python group_by when this module
+has not been compiled.
+"""
+
+
+cpdef dict group_by(list data, object key):
+    """Group row dicts by the value stored under key."""
+    cdef dict groups = {}
+    cdef dict item
+    cdef object group_key
+    cdef list bucket
+    for item in data:
+        group_key = item.get(key)
+        bucket = groups.get(group_key)
+        if bucket is None:
+            bucket = []
+            groups[group_key] = bucket
+        bucket.append(item)
+    return groups
@@ -6,10 +6,37 @@ Separates heavy language projects (Rust/C++/Go/Java/C#) into a separate queue.
 They will only run when the main queue is empty, one at a time.
 """
 
+import fcntl
 import json
+import os
+from collections import Counter
 from pathlib import Path
 
+# orjson parses/serializes in native code; fall back to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def load_json(path):
+    """Parse a JSON file from its raw bytes."""
+    raw = path.read_bytes()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+def save_json(path, obj):
+    """Write obj to path as 2-space indented JSON."""
+    if HAS_ORJSON:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
+
 ideas_file = Path('ideas_log.json')
+pending_file = Path('ideas_log.jsonl')  # ideas appended by idea_generator
 heavy_queue_file = Path('heavy_projects_queue.json')
 
 if not ideas_file.exists():
@@ -17,35 +44,48 @@ if not ideas_file.exists():
     exit(1)
 
 # Load ideas
-with open(ideas_file) as f:
-    ideas = json.load(f)
+ideas = load_json(ideas_file)
+
+# Fold in ideas appended to ideas_log.jsonl that worker2 hasn't taken yet,
+# so heavy ones are split out too. Holding the file's flock (the append
+# lock) until it is emptied below keeps new appends from being lost
+pending_fp = None
+if pending_file.exists():
+    pending_fp = open(pending_file, 'r+b')
+    fcntl.flock(pending_fp.fileno(), fcntl.LOCK_EX)
+    seen = {(i.get('title'), i.get('timestamp')) for i in ideas if isinstance(i, dict)}
+    for line in pending_fp.read().splitlines():
+        if not line.strip():
+            continue
+        try:
+            idea = orjson.loads(line) if HAS_ORJSON else json.loads(line)
+        except ValueError:
+            continue  # torn line from an interrupted append
+        if isinstance(idea, dict) and (idea.get('title'), idea.get('timestamp')) not in seen:
+            ideas.append(idea)
 
 print(f"📋 Current queue: {len(ideas)} ideas")
 print()
 
 # Identify timeout-prone languages
-timeout_prone = ['rust', 'c++', 'go', 'java', 'c#']
+TIMEOUT_PRONE = frozenset(['rust', 'c++', 'go', 'java', 'c#'])
 
-# Separate ideas
+# Separate ideas and count heavy languages in a single pass
 keep = []
 heavy = []
+lang_counts = Counter()
 
 for idea in ideas:
     lang = idea.get('language', 'Python').lower()
-    title = idea.get('title', 'Unknown')
     
-    if lang in timeout_prone:
+    if lang in TIMEOUT_PRONE:
         heavy.append(idea)
+        lang_counts[lang] += 1
     else:
         keep.append(idea)
 
 print(f"🎯 Timeout-prone (heavy) languages found:")
-lang_counts = {}
-for idea in heavy:
-    lang = idea.get('language', 'Python').lower()
-    lang_counts[lang] = lang_counts.get(lang, 0) + 1
-
-for lang, count in sorted(lang_counts.items(), key=lambda x: -x[1]):
+for lang, count in lang_counts.most_common():
     print(f"  - {lang.upper()}: {count} projects")
 
 print()
@@ -64,17 +104,20 @@ if len(heavy) > 10:
 # Backup original
 backup_file = Path('ideas_log_backup_before_cleanup.json')
 if not backup_file.exists():
-    with open(backup_file, 'w') as f:
-        json.dump(ideas, f, indent=2)
+    save_json(backup_file, ideas)
     print(f"\n💾 Full backup saved to {backup_file}")
 
 # Save fast queue
-with open(ideas_file, 'w') as f:
-    json.dump(keep, f, indent=2)
+save_json(ideas_file, keep)
 
 # Save heavy queue
-with open(heavy_queue_file, 'w') as f:
-    json.dump(heavy, f, indent=2)
+save_json(heavy_queue_file, heavy)
+
+# The pending ideas are in one of the two queues now
+if pending_fp is not None:
+    pending_fp.truncate(0)
+    os.fsync(pending_fp.fileno())
+    pending_fp.close()
 
 print(f"\n✅ Queue separated!")
 print(f"   Fast projects: {len(keep)} in ideas_log.json")
@@ -15,75 +15,318 @@ When a project fails 4 times:
 The database grows smarter over time!
 """
 
+import atexit
 import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
+from string import Formatter
 import hashlib
 
+# Error signatures are a single-pass 64-bit blake2b digest (stdlib, unlike
+# xxhash, so every interpreter sharing the databases - system python3, the
+# shared venv, notebook kernels - computes the same keys)
+SIGNATURE_ALGO = 'blake2b_64'
+
+# orjson encodes/decodes in native code; fall back to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def hash_signature(text: str, length: int = 16) -> str:
+    """Non-cryptographic 64-bit hash of text as up to 16 hex chars"""
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()[:length]
+
+_NOW_TTL = 0.5  # seconds a cached ISO timestamp is reused
+_now_cache = (float('-inf'), '')
+
+
+def json_loads(raw):
+    """Parse JSON from str or bytes."""
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, compact unless indent is set."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def write_atomic(path: Path, data: bytes, sync: bool = False):
+    """Replace path with data in one write via a temp file and os.replace.
+    
+    Readers see either the old or the new file, never a torn one. fsync is
+    opt-in so frequent rewrites can coalesce in the page cache.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def now_iso() -> str:
+    """datetime.now().isoformat(), refreshed at most every _NOW_TTL seconds"""
+    global _now_cache
+    stamp, text = _now_cache
+    tick = time.monotonic()
+    if tick - stamp >= _NOW_TTL:
+        text = datetime.now().isoformat()
+        _now_cache = (tick, text)
+    return text
+
+
+def _success_count(fix_entry: dict) -> int:
+    return fix_entry.get('success_count', 1)
+
+
+# Databases with unsaved fixes are flushed and closed when the interpreter exits
+_OPEN_DBS = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_dbs():
+    for db in list(_OPEN_DBS):
+        db.close()
+
+
 class LearningFixDatabase:
-    """Database of fixes learned from solving failures"""
+    """Database of fixes learned from solving failures
+    
+    Fixes are persisted as an append-only JSONL log (one fix per line) and
+    the signature/type indexes are rebuilt in memory on load. The small
+    metadata document lives in its own file and is rewritten on close.
+    """
+    
+    FLUSH_EVERY = 50      # pending fixes that force an immediate flush
+    FLUSH_DELAY = 0.5     # seconds a burst of fixes is coalesced before flushing
+    LOOKUP_CACHE_SIZE = 4096  # memoized (signature, error_type) lookups
+    MAX_FIXES_PER_SIGNATURE = 16  # entries kept in each error_signatures bucket
+    MAX_FIXES_PER_TYPE = 64       # signatures kept in each fixes_by_type bucket
+    
+    _instance = None  # process-wide database returned by instance()
+    _instance_lock = threading.Lock()
     
     def __init__(self):
-        self.db_path = Path('implementation_outputs/fix_database.json')
+        self.db_path = Path('implementation_outputs/fix_database.jsonl')
+        self.meta_path = Path('implementation_outputs/fix_database.meta.json')
+        self.legacy_path = Path('implementation_outputs/fix_database.json')
+        self._lock = threading.RLock()
+        self._fd = None  # O_APPEND fd of the log, opened on the first flush
+        self._buf = []   # encoded records not yet written
+        self._dirty = False
+        self._pending = 0
+        self._batch_depth = 0
+        self._timer = None
+        self._lookup_cache = {}
+        self._reused_count = 0  # fixes in fixes_by_type with success_count > 1
         self.db = self._load_db()
+        _OPEN_DBS.add(self)
+    
+    @classmethod
+    def instance(cls) -> 'LearningFixDatabase':
+        """Return the process-wide database, loading it on the first call"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
     
     def _load_db(self):
         """Load or create the fix database"""
-        if self.db_path.exists():
+        db = self._create_empty_db()
+        if self.meta_path.exists():
             try:
-                with open(self.db_path) as f:
-                    return json.load(f)
-            except:
-                return self._create_empty_db()
-        return self._create_empty_db()
+                db['metadata'].update(json_loads(self.meta_path.read_bytes()))
+            except (OSError, ValueError):
+                pass
+        # total_fixes is recounted from the log rather than trusted from disk
+        db['metadata']['total_fixes'] = 0
+        self.db = db
+        
+        if self.db_path.exists():
+            skipped = 0
+            with open(self.db_path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json_loads(line)
+                    except ValueError:
+                        if line.strip():
+                            skipped += 1  # torn trailing line from an interrupted write
+                        continue
+                    # Signatures are recomputed so logs written with another
+                    # hash (MD5, or XXH3 from older builds) still index correctly
+                    entry = record['entry']
+                    signature = self.get_error_signature(entry.get('error_message', ''))
+                    self._add_fix(signature, record['error_type'], entry)
+            if skipped:
+                print(f"⚠️  Skipped {skipped} unreadable line(s) in {self.db_path}")
+        elif self.legacy_path.exists():
+            self._migrate_legacy()
+        
+        return db
+    
+    def _migrate_legacy(self):
+        """Import fixes from the old single-document fix_database.json"""
+        try:
+            legacy = json_loads(self.legacy_path.read_bytes())
+        except (OSError, ValueError):
+            return
+        
+        self.db['metadata']['created'] = legacy.get('metadata', {}).get('created', self.db['metadata']['created'])
+        for error_type, entries in legacy.get('fixes_by_type', {}).items():
+            for fix_entry in entries:
+                signature = self.get_error_signature(fix_entry.get('error_message', ''))
+                self._add_fix(signature, error_type, fix_entry)
+                self._append(signature, error_type, fix_entry)
+        self.flush()
+        self._save_metadata()
     
     def _create_empty_db(self):
         """Create empty database structure"""
         return {
             'metadata': {
                 'created': datetime.now().isoformat(),
-                'version': '1.0',
+                'version': '2.0',
                 'total_fixes': 0,
                 'reuse_rate': 0.0,
                 'learning_efficiency': 0.0
             },
             'error_signatures': {},  # Hash of error -> list of fixes
-            'fixes_by_type': {
-                'syntax': [],
-                'runtime': [],
-                'logic': [],
-                'missing_imports': [],
-                'compilation': [],
-                'structure': []
+            'fixes_by_type': {  # Error type -> {signature: latest fix}
+                'syntax': {},
+                'runtime': {},
+                'logic': {},
+                'missing_imports': {},
+                'compilation': {},
+                'structure': {}
             },
             'successful_patterns': {}  # Pattern name -> solution
         }
     
+    def _append(self, signature: str, error_type: str, fix_entry: dict):
+        """Queue one encoded fix record for the JSONL log"""
+        record = {'signature': signature, 'error_type': error_type, 'entry': fix_entry}
+        self._buf.append(json_dumps(record) + b'\n')
+        self._dirty = True
+    
     def _save_db(self):
-        """Save database to file"""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.db_path, 'w') as f:
-            json.dump(self.db, f, indent=2)
+        """Write queued log records to the file
+        
+        mk14 workers, the retry system and hard_fix_database users append to
+        the same log from separate processes. All pending records go out in
+        one os.write on an O_APPEND fd, so each lands whole at the end of
+        the file instead of being split across buffered writes that another
+        process's lines could interleave with.
+        """
+        if not self._buf:
+            return
+        if self._fd is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.db_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        data = b''.join(self._buf)
+        self._buf.clear()
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view):]
+    
+    def _save_metadata(self, sync: bool = False):
+        """Rewrite the small metadata document"""
+        # Kept indented: this is the one file people open by hand
+        write_atomic(self.meta_path, json_dumps(self.db['metadata'], indent=True), sync)
+    
+    def close(self):
+        """Flush pending fixes, persist metadata and release the log file"""
+        with self._lock:
+            self.flush()
+            if self._fd is not None:
+                os.fsync(self._fd)
+                self._save_metadata(sync=True)
+                os.close(self._fd)
+                self._fd = None
+    
+    def flush(self):
+        """Write pending fixes to disk now"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty:
+                self._save_db()
+                self._dirty = False
+                self._pending = 0
+    
+    @contextmanager
+    def batch(self):
+        """Defer saving until the block exits, so many fixes cost one write"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+    
+    def _mark_dirty(self):
+        """Record an unsaved change and schedule a coalesced flush"""
+        with self._lock:
+            self._pending += 1
+            if self._batch_depth:
+                return
+            if self._pending >= self.FLUSH_EVERY:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
     
     def get_error_signature(self, error_message: str) -> str:
         """Create hash of error for deduplication"""
         # Take first 100 chars, hash it
         simplified = error_message[:100].strip()
-        return hashlib.md5(simplified.encode()).hexdigest()[:8]
+        return hash_signature(simplified, 8)
     
     def find_similar_fixes(self, error_message: str, error_type: str):
         """Find previously solved similar errors"""
-        signature = self.get_error_signature(error_message)
+        return self.find_similar_fixes_by_signature(self.get_error_signature(error_message), error_type)
+    
+    def find_similar_fixes_by_signature(self, signature: str, error_type: str):
+        """find_similar_fixes for a signature the caller already computed"""
+        key = (signature, error_type)
+        cached = self._lookup_cache.get(key)
+        if cached is not None:
+            return cached
         
         # Check by signature
         if signature in self.db['error_signatures']:
-            return self.db['error_signatures'][signature]
-        
+            result = self.db['error_signatures'][signature]
         # Check by error type
-        if error_type in self.db['fixes_by_type']:
-            return self.db['fixes_by_type'][error_type][:3]  # Top 3
+        elif error_type in self.db['fixes_by_type']:
+            result = list(islice(self.db['fixes_by_type'][error_type].values(), 3))  # Top 3
+        else:
+            result = []
         
-        return []
+        if len(self._lookup_cache) >= self.LOOKUP_CACHE_SIZE:
+            self._lookup_cache.clear()
+        self._lookup_cache[key] = result
+        return result
     
     def log_successful_fix(self, error_type: str, error_message: str, fix: str, language: str):
         """Log a successful fix for future reuse"""
@@ -93,25 +336,47 @@ class LearningFixDatabase:
             'error_message': error_message[:200],
             'fix': fix[:500],  # Store first 500 chars
             'language': language,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now_iso(),
             'success_count': 1
         }
         
-        # Add to signature map
-        if signature not in self.db['error_signatures']:
-            self.db['error_signatures'][signature] = []
-        self.db['error_signatures'][signature].append(fix_entry)
+        with self._lock:
+            self._add_fix(signature, error_type, fix_entry)
+            self._append(signature, error_type, fix_entry)
+            self._mark_dirty()
         
-        # Add to type map
-        if error_type not in self.db['fixes_by_type']:
-            self.db['fixes_by_type'][error_type] = []
-        self.db['fixes_by_type'][error_type].append(fix_entry)
+        return True
+    
+    def _add_fix(self, signature: str, error_type: str, fix_entry: dict):
+        """Insert a fix entry into the in-memory indexes"""
+        self._lookup_cache.clear()
+        # Add to signature map (recent fixes seen for the signature); a full
+        # bucket drops its least successful, oldest entry first
+        bucket = self.db['error_signatures'].setdefault(signature, [])
+        if len(bucket) >= self.MAX_FIXES_PER_SIGNATURE:
+            bucket.remove(min(bucket, key=_success_count))
+        bucket.append(fix_entry)
+        
+        # Add to type map, one entry per signature; a repeat fix for the
+        # same signature counts as a reuse of the earlier one
+        by_signature = self.db['fixes_by_type'].setdefault(error_type, {})
+        previous = by_signature.get(signature)
+        if previous is None and len(by_signature) >= self.MAX_FIXES_PER_TYPE:
+            evicted = by_signature.pop(
+                min(by_signature, key=lambda sig: _success_count(by_signature[sig]))
+            )
+            if _success_count(evicted) > 1:
+                self._reused_count -= 1
+        if previous is not None:
+            fix_entry['success_count'] = previous.get('success_count', 1) + 1
+            if previous.get('success_count', 1) > 1:
+                self._reused_count -= 1
+        if fix_entry.get('success_count', 1) > 1:
+            self._reused_count += 1
+        by_signature[signature] = fix_entry
         
         # Update stats
         self.db['metadata']['total_fixes'] += 1
-        self._save_db()
-        
-        return True
     
     def get_reuse_rate(self):
         """Calculate reuse rate"""
@@ -120,13 +385,7 @@ class LearningFixDatabase:
             return 0.0
         
         # Count how many fixes have been reused (success_count > 1)
-        reused = sum(
-            1 for error_type_fixes in self.db['fixes_by_type'].values()
-            for fix in error_type_fixes
-            if fix.get('success_count', 1) > 1
-        )
-        
-        return (reused / total_fixes * 100) if total_fixes > 0 else 0.0
+        return self._reused_count / total_fixes * 100
     
     def get_stats(self):
         """Get database statistics"""
@@ -146,10 +405,93 @@ class EscalatingRetryStrategy:
         self.error_message = error_message
         self.code = code
         self.language = language
-        self.db = LearningFixDatabase()
+    
+    @property
+    def db(self) -> LearningFixDatabase:
+        return LearningFixDatabase.instance()
+    
+    # (level, aggressiveness, head, tail): head and tail are str.format
+    # templates, and self.code is spliced in between them as-is so the
+    # (possibly large) source is never run through the format parser.
+    # A tail of None means the prompt does not embed the code at all.
+    _PROMPT_SPECS = [
+        # LEVEL 1-5: CONSERVATIVE (Keep existing logic, fix syntax/imports)
+        (1, 'conservative',
+         "Fix only the {error_type} error in this {language} code.\n"
+         "            \n"
+         "Error: {message_200}\n\nCode:\n",
+         "\n\nKeep the existing logic and structure. Only fix the specific error.{similar_context}\n"
+         "Return only fixed code:"),
+        (2, 'conservative',
+         "Add missing imports and fix syntax errors in this {language} code.\n\n"
+         "Error: {error_type}\n\nCode:\n",
+         "\n\nAdd ALL required imports at the top. Keep the rest unchanged.\n"
+         "Return only code:"),
+        (3, 'conservative',
+         "Debug this {language} code to fix the {error_type} error.\n\n"
+         "Error: {message_100}\n\nCode:\n",
+         "\n\nAdd error handling and logging. Keep main logic intact.\n"
+         "Return only code:"),
+        (4, 'conservative',
+         "Fix the {error_type} error and add validation to this {language} code:\n\nCode:\n",
+         "\n\nAdd input validation and error checks. Preserve the structure.\n"
+         "Return only code:"),
+        (5, 'conservative',
+         "Refactor this broken {language} code to fix the {error_type} error:\n\nCode:\n",
+         "\n\nImprove code structure and readability while fixing the error.\n"
+         "Return only code:"),
+        # LEVEL 6-10: MODERATE (Rewrite problem sections)
+        (6, 'moderate',
+         "Rewrite the problematic section causing the {error_type} error:\n\nOriginal code:\n",
+         "\n\nRewrite just the broken part with a better approach.\n"
+         "Return only code:"),
+        (7, 'moderate',
+         "Fix the {error_type} error with a simpler approach:\n\nCode:\n",
+         "\n\nSimplify the implementation while fixing the error.\n"
+         "Return only code:"),
+        (8, 'moderate',
+         "Completely rewrite this {language} function to fix the {error_type} error:\n\nCurrent code:\n",
+         "\n\nImplement it differently from scratch (but keep same input/output).\n"
+         "Return only code:"),
+        (9, 'moderate',
+         "Fix the {error_type} error by breaking into smaller functions:\n\nCode:\n",
+         "\n\nRefactor into helper functions and fix the error.\n"
+         "Return only code:"),
+        (10, 'moderate',
+         "Use a completely different algorithm to fix the {error_type} error:\n\nOriginal approach:\n",
+         "\n\nTry a different algorithm/pattern.\n"
+         "Return only code:"),
+        # LEVEL 11-15: AGGRESSIVE (Different approach, rethink design)
+        (11, 'aggressive',
+         "Redesign this {language} code from scratch fixing the {error_type}:\n\n",
+         "\n\nUse a completely different design pattern.\n"
+         "Return only code:"),
+    ] + [
+        (i, 'aggressive',
+         f"Aggressive fix #{i-11}: Reimplement this {{language}} code eliminating the "
+         f"{{error_type}} error with approach #{i-11}:\n\n",
+         "\n\nApproach: Use async/parallel, caching, memoization, or state machine pattern.\n"
+         "Return only code:")
+        for i in range(12, 16)
+    ] + [
+        # LEVEL 16-20: NUCLEAR (Start from scratch)
+        (16, 'nuclear',
+         "NUCLEAR FIX: Completely rewrite this {language} code from first principles.\n\n"
+         "Original (broken):\n",
+         "\n\nIgnore the original implementation. Write the simplest possible version that works.\n"
+         "Return only code:"),
+    ] + [
+        (i, 'nuclear',
+         f"FINAL ATTEMPT #{i-15}: Start completely from scratch for a {{language}} implementation.\n\n"
+         "Original error type: {error_type}\n\n"
+         "Write the minimal viable implementation that solves the core problem.\n"
+         "Return only code:",
+         None)
+        for i in range(17, 21)
+    ]
     
     def generate_prompts(self):
-        """Generate 20 prompts with escalating aggressiveness"""
+        """Yield 20 prompts with escalating aggressiveness, built on demand"""
         
         # Check database for similar fixes first
         similar_fixes = self.db.find_similar_fixes(self.error_message, self.error_type)
@@ -157,186 +499,62 @@ class EscalatingRetryStrategy:
         if similar_fixes:
             similar_context = f"\n\nPreviously solved similar error:\n{similar_fixes[0]['fix'][:200]}"
         
-        prompts = []
-        
-        # LEVEL 1-5: CONSERVATIVE (Keep existing logic, fix syntax/imports)
-        prompts.append({
-            'level': 1,
-            'aggressiveness': 'conservative',
-            'prompt': f"""Fix only the {self.error_type} error in this {self.language} code.
-            
-Error: {self.error_message[:200]}
-
-Code:
-{self.code}
-
-Keep the existing logic and structure. Only fix the specific error.{similar_context}
-Return only fixed code:"""
-        })
-        
-        prompts.append({
-            'level': 2,
-            'aggressiveness': 'conservative',
-            'prompt': f"""Add missing imports and fix syntax errors in this {self.language} code.
-
-Error: {self.error_type}
-
-Code:
-{self.code}
-
-Add ALL required imports at the top. Keep the rest unchanged.
-Return only code:"""
-        })
-        
-        prompts.append({
-            'level': 3,
-            'aggressiveness': 'conservative',
-            'prompt': f"""Debug this {self.language} code to fix the {self.error_type} error.
-
-Error: {self.error_message[:100]}
-
-Code:
-{self.code}
-
-Add error handling and logging. Keep main logic intact.
-Return only code:"""
-        })
-        
-        prompts.append({
-            'level': 4,
-            'aggressiveness': 'conservative',
-            'prompt': f"""Fix the {self.error_type} error and add validation to this {self.language} code:
-
-Code:
-{self.code}
-
-Add input validation and error checks. Preserve the structure.
-Return only code:"""
-        })
-        
-        prompts.append({
-            'level': 5,
-            'aggressiveness': 'conservative',
-            'prompt': f"""Refactor this broken {self.language} code to fix the {self.error_type} error:
-
-Code:
-{self.code}
-
-Improve code structure and readability while fixing the error.
-Return only code:"""
-        })
-        
-        # LEVEL 6-10: MODERATE (Rewrite problem sections)
-        prompts.append({
-            'level': 6,
-            'aggressiveness': 'moderate',
-            'prompt': f"""Rewrite the problematic section causing the {self.error_type} error:
-
-Original code:
-{self.code}
-
-Rewrite just the broken part with a better approach.
-Return only code:"""
-        })
-        
-        prompts.append({
-            'level': 7,
-            'aggressiveness': 'moderate',
-            'prompt': f"""Fix the {self.error_type} error with a simpler approach:
-
-Code:
-{self.code}
-
-Simplify the implementation while fixing the error.
-Return only code:"""
-        })
-        
-        prompts.append({
-            'level': 8,
-            'aggressiveness': 'moderate',
-            'prompt': f"""Completely rewrite this {self.language} function to fix the {self.error_type} error:
-
-Current code:
-{self.code}
-
-Implement it differently from scratch (but keep same input/output).
-Return only code:"""
-        })
-        
-        prompts.append({
-            'level': 9,
-            'aggressiveness': 'moderate',
-            'prompt': f"""Fix the {self.error_type} error by breaking into smaller functions:
-
-Code:
-{self.code}
-
-Refactor into helper functions and fix the error.
-Return only code:"""
-        })
-        
-        prompts.append({
-            'level': 10,
-            'aggressiveness': 'moderate',
-            'prompt': f"""Use a completely different algorithm to fix the {self.error_type} error:
-
-Original approach:
-{self.code}
-
-Try a different algorithm/pattern.
-Return only code:"""
-        })
-        
-        # LEVEL 11-15: AGGRESSIVE (Different approach, rethink design)
-        prompts.append({
-            'level': 11,
-            'aggressiveness': 'aggressive',
-            'prompt': f"""Redesign this {self.language} code from scratch fixing the {self.error_type}:
-
-{self.code}
-
-Use a completely different design pattern.
-Return only code:"""
-        })
-        
-        for i in range(12, 16):
-            prompts.append({
-                'level': i,
-                'aggressiveness': 'aggressive',
-                'prompt': f"""Aggressive fix #{i-11}: Reimplement this {self.language} code eliminating the {self.error_type} error with approach #{i-11}:
-
-{self.code}
-
-Approach: Use async/parallel, caching, memoization, or state machine pattern.
-Return only code:"""
-            })
-        
-        # LEVEL 16-20: NUCLEAR (Start from scratch)
-        prompts.append({
-            'level': 16,
-            'aggressiveness': 'nuclear',
-            'prompt': f"""NUCLEAR FIX: Completely rewrite this {self.language} code from first principles.
-
-Original (broken):
-{self.code}
-
-Ignore the original implementation. Write the simplest possible version that works.
-Return only code:"""
-        })
+        # language/error_type are already baked into the cached templates;
+        # only these per-instance fields are left to substitute
+        fields = {
+            'message_200': self.error_message[:200],
+            'message_100': self.error_message[:100],
+            'similar_context': similar_context,
+        }
+        code = self.code
+        specs = _specialized_prompt_specs(self.language, self.error_type)
         
-        for i in range(17, 21):
-            prompts.append({
-                'level': i,
-                'aggressiveness': 'nuclear',
-                'prompt': f"""FINAL ATTEMPT #{i-15}: Start completely from scratch for a {self.language} implementation.
+        for level, aggressiveness, head, head_dynamic, tail, tail_dynamic in specs:
+            if head_dynamic:
+                head = head.format_map(fields)
+            if tail is None:
+                prompt = head
+            else:
+                if tail_dynamic:
+                    tail = tail.format_map(fields)
+                prompt = ''.join((head, code, tail))
+            yield {
+                'level': level,
+                'aggressiveness': aggressiveness,
+                'prompt': prompt,
+            }
 
-Original error type: {self.error_type}
 
-Write the minimal viable implementation that solves the core problem.
-Return only code:"""
-            })
-        
-        return prompts
+@lru_cache(maxsize=64)
+def _specialized_prompt_specs(language: str, error_type: str) -> tuple:
+    """Partially apply EscalatingRetryStrategy._PROMPT_SPECS to one language/error type.
+    
+    Each spec becomes (level, aggressiveness, head, head_dynamic, tail,
+    tail_dynamic). A part flagged dynamic is still a template over the
+    per-instance fields; any other part is final text used as-is.
+    """
+    # Per-instance fields map to their own placeholder so they survive this
+    # pass, and braces in the baked-in values are escaped for the next one
+    fields = {
+        'language': language.replace('{', '{{').replace('}', '}}'),
+        'error_type': error_type.replace('{', '{{').replace('}', '}}'),
+        'message_200': '{message_200}',
+        'message_100': '{message_100}',
+        'similar_context': '{similar_context}',
+    }
+    
+    def specialize(template):
+        text = template.format_map(fields)
+        if any(field for _, field, _, _ in Formatter().parse(text)):
+            return text, True
+        return text.format(), False
+    
+    specs = []
+    for level, aggressiveness, head, tail in EscalatingRetryStrategy._PROMPT_SPECS:
+        head, head_dynamic = specialize(head)
+        tail, tail_dynamic = specialize(tail) if tail is not None else (None, False)
+        specs.append((level, aggressiveness, head, head_dynamic, tail, tail_dynamic))
+    return tuple(specs)
 
 
 def escalate_retry_for_project(project_name: str, errors: list, idea: dict, learning_db: 'LearningFixDatabase'):
@@ -376,8 +594,10 @@ def escalate_retry_for_project(project_name: str, errors: list, idea: dict, lear
     else:
         error_text = str(errors)
     
-    # Check if we have similar fixes in the learning database
-    similar_fixes = learning_db.find_similar_fixes(error_text, error_type) if error_text else []
+    # Check if we have similar fixes in the learning database; the signature
+    # is hashed once here and carried on every escalated idea
+    signature = learning_db.get_error_signature(error_text) if error_text else None
+    similar_fixes = learning_db.find_similar_fixes_by_signature(signature, error_type) if error_text else []
     reuse_rate = learning_db.db['metadata'].get('reuse_rate', 0)
     
     # Generate escalated retry ideas with different aggressiveness levels
@@ -385,42 +605,57 @@ def escalate_retry_for_project(project_name: str, errors: list, idea: dict, lear
     escalated_ideas = []
     levels = ['Conservative', 'Moderate', 'Aggressive', 'Nuclear']
     
+    # Specific instructions for each level
+    instructions = {
+        'Conservative': 'Focus on fixing specific identified errors while maintaining code quality.',
+        'Moderate': 'Be more aggressive with refactoring to fix root causes. Consider alternative approaches.',
+        'Aggressive': 'Completely rewrite if necessary. Try different design patterns and libraries.',
+        'Nuclear': 'Use the most powerful approach available. Break compatibility if needed to make it work.'
+    }
+    
+    # Fields shared by every variation are built once; the loop copies this
+    # template and fills in the per-variation keys (None here keeps key order)
+    similar_count = len(similar_fixes)
+    learning_note = (
+        f"\n\n[Learning DB: {similar_count} similar fixes found with {reuse_rate:.1f}% reuse rate]"
+        if similar_fixes else ""
+    )
+    description = idea.get('description', '') + learning_note
+    base_idea = {
+        'title': None,
+        'description': description,
+        'code': idea.get('code', ''),
+        'language': idea.get('language', 'Python'),
+        'is_escalated_retry': True,
+        'escalation_level': None,
+        'escalation_index': None,
+        'variation': None,
+        'original_project': project_name,
+        'base_project_name': project_name,  # Track base name for throttling
+        'error_context': error_text,
+        'error_type': error_type,
+        'error_signature': signature,
+        'learning_reuse_applicable': similar_count > 0,
+        'similar_fixes_count': similar_count,
+        'learning_db_reuse_rate': reuse_rate,
+        'priority': None,
+        'escalation_instruction': None,
+    }
+    if similar_fixes:
+        base_idea['learned_fixes'] = similar_fixes[:3]  # Top 3 similar fixes
+    title = idea.get('title', 'Project')
+    
     for level_idx, level in enumerate(levels):
         for variation in range(2):  # 2 variations per level = 8 total
-            escalated_idea = {
-                'title': f"{idea.get('title', 'Project')} - Escalation L{level_idx + 1} (v{variation + 1})",
-                'description': idea.get('description', ''),
-                'code': idea.get('code', ''),
-                'language': idea.get('language', 'Python'),
-                'is_escalated_retry': True,
-                'escalation_level': level,
-                'escalation_index': level_idx + 1,
-                'variation': variation + 1,
-                'original_project': project_name,
-                'base_project_name': project_name,  # Track base name for throttling
-                'error_context': error_text,
-                'error_type': error_type,
-                'learning_reuse_applicable': len(similar_fixes) > 0,
-                'similar_fixes_count': len(similar_fixes),
-                'learning_db_reuse_rate': reuse_rate,
-                'priority': 5 + level_idx  # Lower priority for aggressive levels
-            }
-            
-            # Add specific instructions for each level
-            instructions = {
-                'Conservative': 'Focus on fixing specific identified errors while maintaining code quality.',
-                'Moderate': 'Be more aggressive with refactoring to fix root causes. Consider alternative approaches.',
-                'Aggressive': 'Completely rewrite if necessary. Try different design patterns and libraries.',
-                'Nuclear': 'Use the most powerful approach available. Break compatibility if needed to make it work.'
-            }
-            
-            escalated_idea['escalation_instruction'] = instructions[level]
-            
-            # Add learning database suggestions if we have similar fixes
-            if similar_fixes:
-                escalated_idea['learned_fixes'] = similar_fixes[:3]  # Top 3 similar fixes
-                escalated_idea['description'] += f"\n\n[Learning DB: {len(similar_fixes)} similar fixes found with {reuse_rate:.1f}% reuse rate]"
-            
+            escalated_idea = base_idea.copy()
+            escalated_idea.update(
+                title=f"{title} - Escalation L{level_idx + 1} (v{variation + 1})",
+                escalation_level=level,
+                escalation_index=level_idx + 1,
+                variation=variation + 1,
+                priority=5 + level_idx,  # Lower priority for aggressive levels
+                escalation_instruction=instructions[level],
+            )
             escalated_ideas.append(escalated_idea)
     
     return escalated_ideas
@@ -428,7 +663,7 @@ def escalate_retry_for_project(project_name: str, errors: list, idea: dict, lear
 
 if __name__ == "__main__":
     # Example usage
-    db = LearningFixDatabase()
+    db = LearningFixDatabase.instance()
     print("📚 Learning Fix Database")
     print(f"Total fixes learned: {db.db['metadata']['total_fixes']}")
     stats = db.get_stats()
@@ -11,39 +11,229 @@ When a project fails 4 times (including smart retry):
 This creates a growing library of working solutions.
 """
 
-import json
+import fcntl
+import mmap
+import os
 import re
+import sys
+from bisect import bisect_right
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, List, Tuple, Optional
-import hashlib
+
+from escalating_retry_system import SIGNATURE_ALGO, hash_signature, json_dumps, json_loads, now_iso, write_atomic
+
+# Line number reported in an error message
+_LINE_NUMBER_RE = re.compile(r'line (\d+)', re.IGNORECASE)
+
+# Entry-point extensions, in the order they are preferred
+_MAIN_EXT_RANK = {ext: rank for rank, ext in enumerate(['py', 'js', 'java', 'cpp', 'cs', 'go', 'rs'])}
+
+_NEWLINE_RE = re.compile('\n')
+
+# Placeholder markers and bracket characters checked by _find_syntax_issue
+_PLACEHOLDER_RE = re.compile(r'TODO|FIXME|# \.\.\.')
+_BRACKET_RE = re.compile(r'[()\[\]{}]')
+
+# Error-message normalization applied before hashing a signature
+_LINE_RE = re.compile(r'line \d+')
+_PATH_RE = re.compile(r'/[^\s]+')
+_STRING_RE = re.compile(r'["\'].*?["\']')
+
+
+def _line_starts(text: str) -> List[int]:
+    """Offsets at which each '\n'-separated line of text begins."""
+    return [0] + [m.end() for m in _NEWLINE_RE.finditer(text)]
+
+
+def _slice_lines(text: str, starts: List[int], first: int, stop: int) -> str:
+    """Same as '\n'.join(text.split('\n')[first:stop]) without splitting."""
+    count = len(starts)
+    first = max(first, 0)
+    stop = min(stop, count)
+    if first >= stop:
+        return ''
+    end = starts[stop] - 1 if stop < count else len(text)
+    return text[starts[first]:end]
+
+
+@contextmanager
+def _mapped(path: Path):
+    """Map a file read-only; empty files (which mmap rejects) yield b''."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _decode_lines(buf, first: int, stop: int) -> str:
+    """Decode lines [first, stop) of a bytes-like buffer, touching nothing after them."""
+    first = max(first, 0)
+    if first >= stop:
+        return ''
+    start = 0
+    for _ in range(first):
+        newline = buf.find(b'\n', start)
+        if newline == -1:
+            return ''
+        start = newline + 1
+    end = start
+    for _ in range(stop - first):
+        newline = buf.find(b'\n', end)
+        if newline == -1:
+            end = len(buf)
+            break
+        end = newline + 1
+    else:
+        end -= 1  # drop the newline that ends the last requested line
+    return buf[start:end].decode('utf-8', 'replace').replace('\r\n', '\n')
 
 
 class HardFixDatabase:
+    MAX_SCAN_LINES = 2000  # leading lines _find_syntax_issue inspects
+    COMPACT_EVERY = 1000   # delta records appended before the snapshot is rewritten
+    
     def __init__(self):
         self.db_path = Path('implementation_outputs/hard_fixes_database.json')
+        self.delta_path = Path('implementation_outputs/hard_fixes.delta.jsonl')
+        self.lock_path = Path('implementation_outputs/hard_fixes.lock')
         self.active_fixes_path = Path('implementation_outputs/active_fix_attempts.json')
+        # Loading only reads; a long replayed log is folded into the
+        # snapshot by the first compact() this instance's appends trigger
+        self._delta_lines = 0
         self.db = self.load_database()
+        self._index_fixes()
+    
+    @contextmanager
+    def _locked(self, mode: int):
+        """Hold the database flock: LOCK_SH to append, LOCK_EX to compact.
+        
+        Processes append to the delta log concurrently, but none can append
+        between compact() reading the log and deleting it.
+        """
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, mode)
+            yield
+        finally:
+            os.close(fd)  # also drops the flock
         
     def load_database(self) -> Dict:
-        """Load the hard fixes database."""
-        if not self.db_path.exists():
-            return {
+        """Load the hard fixes snapshot and replay the delta log over it."""
+        if self.db_path.exists():
+            db = json_loads(self.db_path.read_bytes())
+        else:
+            db = {
                 'fixes': {},
                 'metadata': {
                     'total_fixes': 0,
-                    'last_updated': datetime.now().isoformat()
+                    'signature_algo': SIGNATURE_ALGO,
+                    'last_updated': now_iso()
                 }
             }
-        with open(self.db_path) as f:
-            return json.load(f)
+        self._delta_lines = self._replay_delta(db)
+        if db.get('metadata', {}).get('signature_algo') != SIGNATURE_ALGO:
+            self._rekey_fixes(db)
+            # Persist the new keys with the first append's compaction, so
+            # the one-off migration isn't redone on every load
+            self._delta_lines = self.COMPACT_EVERY
+        return db
+    
+    def _replay_delta(self, db: Dict) -> int:
+        """Apply upserts from the delta log to db; returns records applied."""
+        if not self.delta_path.exists():
+            return 0
+        applied = 0
+        fixes = db.setdefault('fixes', {})
+        with open(self.delta_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json_loads(line)
+                except ValueError:
+                    continue  # torn trailing line from an interrupted write
+                if record.get('op') == 'upsert':
+                    fixes[record['id']] = record['fix']
+                    applied += 1
+        return applied
+    
+    def _rekey_fixes(self, db: Dict):
+        """Recompute signatures for fixes stored under a different hash.
+        
+        A one-off migration from MD5 or XXH3 snapshots: SIGNATURE_ALGO no
+        longer depends on which modules the interpreter has. Only the first
+        200 chars of each message are stored, so fixes for longer messages
+        may not re-match exactly after it.
+        """
+        rekeyed = {}
+        for fix_data in db.get('fixes', {}).values():
+            signature = self._create_error_signature(
+                fix_data.get('error_type', ''), fix_data.get('error_message_pattern', '')
+            )
+            fix_data['error_signature'] = signature
+            rekeyed[f"{signature}_{fix_data.get('language', '')}"] = fix_data
+        db['fixes'] = rekeyed
+        db.setdefault('metadata', {})['signature_algo'] = SIGNATURE_ALGO
+    
+    def _index_fixes(self):
+        """Map (error_signature, language) to its verified fix for O(1) lookup."""
+        self._by_sig_lang = {
+            (fix_data.get('error_signature'), fix_data.get('language')): fix_data
+            for fix_data in self.db.get('fixes', {}).values()
+            if fix_data.get('verified', False)
+        }
     
     def save_database(self):
         """Save the hard fixes database."""
-        self.db['metadata']['last_updated'] = datetime.now().isoformat()
+        self.db['metadata']['last_updated'] = now_iso()
         self.db['metadata']['total_fixes'] = len(self.db['fixes'])
-        with open(self.db_path, 'w') as f:
-            json.dump(self.db, f, indent=2)
+        # Stored compact and not fsynced; the delta log carries per-fix writes
+        write_atomic(self.db_path, json_dumps(self.db))
+    
+    def compact(self):
+        """Write a fresh snapshot and drop the delta log it now contains.
+        
+        The snapshot is rebuilt from disk (snapshot plus the whole log) under
+        the exclusive lock rather than from this instance's memory, so
+        upserts other processes appended since it loaded, and snapshots they
+        compacted, end up in it before the log is deleted. This instance's
+        own upserts are all in the log, so nothing of its state is lost.
+        """
+        with self._locked(fcntl.LOCK_EX):
+            self.db = self.load_database()
+            self.save_database()
+            # Replaying a leftover log after a crash here is harmless: upserts
+            # are idempotent against the snapshot that already holds them
+            if self.delta_path.exists():
+                self.delta_path.unlink()
+        self._delta_lines = 0
+        self._index_fixes()
+    
+    def write_pretty_snapshot(self) -> Path:
+        """Write an indented copy of the database for people to read."""
+        pretty_path = self.db_path.with_name('hard_fixes_database.pretty.json')
+        write_atomic(pretty_path, json_dumps(self.db, indent=True))
+        return pretty_path
+    
+    def _append_delta(self, fix_id: str):
+        """Record the current state of one fix in the delta log."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        record = {'id': fix_id, 'op': 'upsert', 'fix': self.db['fixes'][fix_id]}
+        with self._locked(fcntl.LOCK_SH):
+            # One write on an O_APPEND fd: concurrent appenders' records
+            # never interleave
+            fd = os.open(self.delta_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, json_dumps(record) + b'\n')
+            finally:
+                os.close(fd)
+        self.db['metadata']['last_updated'] = now_iso()
+        self._delta_lines += 1
+        if self._delta_lines >= self.COMPACT_EVERY:
+            self.compact()
     
     def extract_error_and_code_block(self, project_dir: Path, error_log: List[Dict]) -> Optional[Dict]:
         """Extract the specific error and problematic code block."""
@@ -56,52 +246,45 @@ class HardFixDatabase:
         error_type = latest_error.get('error_type', '')
         
         # Try to find the main code file
-        code_file = None
-        for ext in ['.py', '.js', '.java', '.cpp', '.cs', '.go', '.rs']:
-            potential = project_dir / f'main{ext}'
-            if potential.exists():
-                code_file = potential
-                break
-        
-        if not code_file or not code_file.exists():
+        code_file = self._find_main_file(project_dir)
+        if not code_file:
             return None
         
-        code_content = code_file.read_text()
-        
         # Extract line number from error if available
         line_number = None
-        line_match = re.search(r'line (\d+)', error_message, re.IGNORECASE)
+        line_match = _LINE_NUMBER_RE.search(error_message)
         if line_match:
             line_number = int(line_match.group(1))
         
-        # Extract problematic code block
-        code_lines = code_content.split('\n')
-        
-        if line_number:
-            # Get context around the error (10 lines before and after)
-            start = max(0, line_number - 11)  # -1 for 0-indexing, -10 for context
-            end = min(len(code_lines), line_number + 10)
-            problem_block = '\n'.join(code_lines[start:end])
-            block_start_line = start + 1
-        else:
-            # If no line number, try to find the problematic section by error type
-            if 'syntax' in error_type.lower() or 'SyntaxError' in error_message:
-                # Find incomplete structures
-                problem_block = self._find_syntax_issue(code_content)
-                block_start_line = 1
-            elif 'import' in error_message.lower() or 'ModuleNotFoundError' in error_message:
-                # Get import section
-                import_lines = [i for i, line in enumerate(code_lines) if 'import' in line]
-                if import_lines:
-                    problem_block = '\n'.join(code_lines[:max(import_lines) + 5])
+        # Extract problematic code block; the file is mapped and only the
+        # lines that end up in the block are decoded
+        with _mapped(code_file) as code_bytes:
+            if line_number:
+                # Get context around the error (10 lines before and after)
+                start = max(0, line_number - 11)  # -1 for 0-indexing, -10 for context
+                problem_block = _decode_lines(code_bytes, start, line_number + 10)
+                block_start_line = start + 1
+            else:
+                # If no line number, try to find the problematic section by error type
+                if 'syntax' in error_type.lower() or 'SyntaxError' in error_message:
+                    # Find incomplete structures (the scan never looks past this head)
+                    head = _decode_lines(code_bytes, 0, self.MAX_SCAN_LINES + 15)
+                    problem_block = self._find_syntax_issue(head)
                     block_start_line = 1
+                elif 'import' in error_message.lower() or 'ModuleNotFoundError' in error_message:
+                    # Get import section, up to 5 lines past the last import
+                    last_import = code_bytes.rfind(b'import')
+                    if last_import != -1:
+                        last_import_line = code_bytes[:last_import].count(b'\n')
+                        problem_block = _decode_lines(code_bytes, 0, last_import_line + 5)
+                        block_start_line = 1
+                    else:
+                        problem_block = _decode_lines(code_bytes, 0, 20)
+                        block_start_line = 1
                 else:
-                    problem_block = '\n'.join(code_lines[:20])
+                    # Take first 30 lines as default
+                    problem_block = _decode_lines(code_bytes, 0, 30)
                     block_start_line = 1
-            else:
-                # Take first 30 lines as default
-                problem_block = '\n'.join(code_lines[:30])
-                block_start_line = 1
         
         # Create error signature for matching similar issues
         error_signature = self._create_error_signature(error_type, error_message)
@@ -114,44 +297,70 @@ class HardFixDatabase:
             'block_start_line': block_start_line,
             'full_file_path': str(code_file),
             'language': code_file.suffix[1:],  # Remove the dot
-            'extracted_at': datetime.now().isoformat()
+            'extracted_at': now_iso()
         }
     
+    def _find_main_file(self, project_dir: Path) -> Optional[Path]:
+        """Find main.<ext> with a single directory read instead of a stat per extension."""
+        best_path, best_rank = None, len(_MAIN_EXT_RANK)
+        try:
+            with os.scandir(project_dir) as entries:
+                for entry in entries:
+                    if not entry.name.startswith('main.'):
+                        continue
+                    rank = _MAIN_EXT_RANK.get(entry.name[5:])
+                    if rank is not None and rank < best_rank and entry.is_file():
+                        best_path, best_rank = entry.path, rank
+        except OSError:
+            return None
+        return Path(best_path) if best_path else None
+    
     def _create_error_signature(self, error_type: str, error_message: str) -> str:
         """Create a signature for matching similar errors."""
         # Normalize the error message
         normalized = error_message.lower()
         # Remove line numbers and file paths
-        normalized = re.sub(r'line \d+', 'line X', normalized)
-        normalized = re.sub(r'/[^\s]+', '/path', normalized)
-        normalized = re.sub(r'["\'].*?["\']', 'STRING', normalized)
+        normalized = _LINE_RE.sub('line X', normalized)
+        normalized = _PATH_RE.sub('/path', normalized)
+        normalized = _STRING_RE.sub('STRING', normalized)
         
         # Create hash
-        signature = f"{error_type}:{normalized}"
-        return hashlib.md5(signature.encode()).hexdigest()[:16]
+        return hash_signature(f"{error_type}:{normalized}")
     
     def _find_syntax_issue(self, code: str) -> str:
         """Try to identify the section with syntax issues."""
-        lines = code.split('\n')
+        # Only the first MAX_SCAN_LINES lines are inspected; keep 15 more so
+        # a hit on the last scanned line still gets its full window
+        limit = self.MAX_SCAN_LINES
+        newlines = list(islice(_NEWLINE_RE.finditer(code), limit + 15))
+        if len(newlines) == limit + 15:
+            code = code[:newlines[-1].start()]
+        starts = _line_starts(code)
+        scan_limit = starts[limit] - 1 if len(starts) > limit else len(code)
         
-        # Look for common syntax problems
-        for i, line in enumerate(lines):
-            # Unclosed brackets/parens
-            if line.count('(') != line.count(')') or \
-               line.count('[') != line.count(']') or \
-               line.count('{') != line.count('}'):
-                start = max(0, i - 5)
-                end = min(len(lines), i + 15)
-                return '\n'.join(lines[start:end])
-            
-            # TODO or placeholder comments that might break code
-            if 'TODO' in line or 'FIXME' in line or '# ...' in line:
-                start = max(0, i - 5)
-                end = min(len(lines), i + 15)
-                return '\n'.join(lines[start:end])
+        # TODO or placeholder comments that might break code: one search over
+        # the scanned text, which also bounds the bracket scan below
+        placeholder = _PLACEHOLDER_RE.search(code, 0, scan_limit)
+        scan_end = placeholder.start() if placeholder else scan_limit
+        hit = bisect_right(starts, scan_end) - 1 if placeholder else None
+        
+        # Unclosed brackets/parens; lines without any bracket are skipped
+        # before paying for the six count() calls
+        has_bracket = _BRACKET_RE.search
+        for i, line in enumerate(code[:scan_end].split('\n')):
+            if has_bracket(line) and (
+                line.count('(') != line.count(')') or
+                line.count('[') != line.count(']') or
+                line.count('{') != line.count('}')
+            ):
+                hit = i
+                break
+        
+        if hit is not None:
+            return _slice_lines(code, starts, hit - 5, hit + 15)
         
         # Default: return first 30 lines
-        return '\n'.join(lines[:30])
+        return _slice_lines(code, starts, 0, 30)
     
     def create_fix_attempt(self, project_name: str, error_data: Dict, attempt_number: int) -> Dict:
         """Create a new fix attempt with specific instructions."""
@@ -187,7 +396,7 @@ Success rate: {similar_fix['success_count']}/{similar_fix['total_attempts']}"""
             'error_data': error_data,
             'fix_instructions': fix_instructions,
             'has_similar_fix': similar_fix is not None,
-            'created_at': datetime.now().isoformat()
+            'created_at': now_iso()
         }
     
     def _generate_targeted_fix(self, error_type: str, error_message: str, 
@@ -243,15 +452,7 @@ PROBLEMATIC CODE:
     
     def find_similar_fix(self, error_signature: str, language: str) -> Optional[Dict]:
         """Find a proven fix for a similar error."""
-        fixes = self.db.get('fixes', {})
-        
-        for fix_id, fix_data in fixes.items():
-            if (fix_data.get('error_signature') == error_signature and 
-                fix_data.get('language') == language and
-                fix_data.get('verified', False)):
-                return fix_data
-        
-        return None
+        return self._by_sig_lang.get((error_signature, language))
     
     def save_working_fix(self, project_name: str, error_data: Dict, 
                         working_code: str, fix_description: str):
@@ -262,7 +463,7 @@ PROBLEMATIC CODE:
             # Update existing fix
             self.db['fixes'][fix_id]['success_count'] += 1
             self.db['fixes'][fix_id]['total_attempts'] += 1
-            self.db['fixes'][fix_id]['last_used'] = datetime.now().isoformat()
+            self.db['fixes'][fix_id]['last_used'] = now_iso()
             self.db['fixes'][fix_id]['projects'].append(project_name)
         else:
             # Create new fix entry
@@ -276,12 +477,13 @@ PROBLEMATIC CODE:
                 'success_count': 1,
                 'total_attempts': 1,
                 'verified': True,
-                'created_at': datetime.now().isoformat(),
-                'last_used': datetime.now().isoformat(),
+                'created_at': now_iso(),
+                'last_used': now_iso(),
                 'projects': [project_name]
             }
+            self._by_sig_lang[(error_data['error_signature'], error_data['language'])] = self.db['fixes'][fix_id]
         
-        self.save_database()
+        self._append_delta(fix_id)
         print(f"  💾 Saved working fix to database: {fix_id}")
         print(f"     Success rate: {self.db['fixes'][fix_id]['success_count']}/{self.db['fixes'][fix_id]['total_attempts']}")
 
@@ -290,6 +492,10 @@ def main():
     """Test the hard fix database."""
     db = HardFixDatabase()
     
+    if len(sys.argv) > 1 and sys.argv[1] == '--pretty':
+        print(f"📝 Wrote readable snapshot: {db.write_pretty_snapshot()}")
+        return
+    
     print("🔧 Hard Fix Database System\n")
     print("=" * 70)
     
@@ -9,46 +9,255 @@ Health Monitor - Detects and recovers from system stalls
 - Sends alerts
 """
 
+import ctypes
+import ctypes.util
 import json
+import os
+import select
+import struct
 import subprocess
 import time
+from enum import IntFlag
 from pathlib import Path
-from datetime import datetime
 import sys
 
+# orjson parses in native code; fall back to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+class Issue(IntFlag):
+    """Problems diagnose() can report; auto_recover acts on these bits."""
+    WORKER2_DOWN = 1
+    RETRY_DOWN = 2
+    OUTLINE_DOWN = 4
+    STATUS_MISSING = 8
+    STATUS_STALE = 16
+    IDEAS_STUCK = 32      # warning only: not by itself unhealthy
+    IDEAS_CORRUPT = 64
+    RETRY_CORRUPT = 128
+    QUEUE_INVALID = 256   # any check_file_corruption finding
+
+
+_PROCESS_ISSUES = {
+    'worker2.py': Issue.WORKER2_DOWN,
+    'retry_manager.py': Issue.RETRY_DOWN,
+    'outline': Issue.OUTLINE_DOWN,
+}
+
+
+# inotify (Linux): a file was rewritten in place or renamed into the directory
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len; name follows
+
+
+def _open_inotify(directories):
+    """Watch directories for finished writes; returns (fd, {wd: dir}) or None."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None  # no inotify here (non-Linux); caller falls back to polling
+    if fd < 0:
+        return None
+    watches = {}
+    for directory in directories:
+        wd = libc.inotify_add_watch(fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO)
+        if wd >= 0:
+            watches[wd] = directory
+    if not watches:
+        os.close(fd)
+        return None
+    return fd, watches
+
+
+def _read_inotify(fd, watches):
+    """Drain pending inotify events; returns the set of paths they name."""
+    changed = set()
+    while True:
+        try:
+            buf = os.read(fd, 65536)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(buf):
+            wd, _mask, _cookie, length = _INOTIFY_EVENT.unpack_from(buf, offset)
+            offset += _INOTIFY_EVENT.size
+            name = buf[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if wd in watches and name:
+                changed.add(watches[wd] / os.fsdecode(name))
+
+
+def _json_array_is_empty(path):
+    """True if path holds an empty JSON array, judged from its first bytes only."""
+    with open(path, 'rb') as f:
+        head = f.read(64).lstrip()
+    return head.startswith(b'[') and head[1:].lstrip().startswith(b']')
+
+
+def _count_json_lines(path):
+    """Number of non-blank lines in a JSON-lines file, 0 if it doesn't exist."""
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return 0
+    return sum(1 for line in raw.splitlines() if line.strip())
+
+
+def _reset_json_array(path):
+    """Replace path with an empty JSON array via an fsynced .tmp and os.replace."""
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(b'[]')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# path -> (st_mtime_ns, st_size, parsed data or the decode error it raised)
+_json_cache = {}
+
+
+def _load_json_cached(path):
+    """Parse a JSON file, reusing the last parse while its mtime and size hold.
+    
+    A file that failed to parse keeps raising the same error until it changes,
+    without being read again.
+    """
+    st = path.stat()
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        result = cached[2]
+    else:
+        try:
+            raw = path.read_bytes()
+            result = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+        except json.JSONDecodeError as e:  # orjson's decode error subclasses this
+            result = e
+        _json_cache[path] = (st.st_mtime_ns, st.st_size, result)
+    if isinstance(result, json.JSONDecodeError):
+        raise result.with_traceback(None)
+    return result
+
+
+def _scan_processes():
+    """One pass over /proc: [(pid, command line)] in pid order, excluding ourselves."""
+    me = os.getpid()
+    procs = []
+    for entry in os.scandir('/proc'):
+        if not entry.name.isdigit() or int(entry.name) == me:
+            continue
+        try:
+            with open(f'/proc/{entry.name}/cmdline', 'rb') as f:
+                raw = f.read()
+        except OSError:
+            continue  # exited mid-scan or not ours to read
+        if raw:
+            cmdline = raw.rstrip(b'\0').replace(b'\0', b' ').decode(errors='replace')
+            procs.append((int(entry.name), cmdline))
+    procs.sort()
+    return procs
+
 
 class HealthMonitor:
     def __init__(self):
         self.status_file = Path('worker2_status.json')
         self.ideas_file = Path('ideas_log.json')
+        # Ideas idea_generator appended that worker2 hasn't folded in yet
+        self.pending_ideas_file = Path('ideas_log.jsonl')
         self.retry_file = Path('implementation_outputs/retry_queue.json')
         self.qa_file = Path('QAissue.json')
         
         self.stale_threshold = 120  # 2 minutes
         self.check_interval = 30    # Check every 30 seconds
         self.stuck_ideas_threshold = 300  # 5 minutes
+        self.process_scan_ttl = 1.0  # seconds one /proc scan answers all lookups
+        self._process_scan = (0.0, [])
+        self.diagnose_ttl = 5  # seconds a diagnose() result is reused
+        self._last_diag = None  # (monotonic time, (healthy, Issue flags))
+        self.kill_timeout = 5.0     # longest wait for a killed process to exit
+        self.startup_timeout = 3.0  # longest wait for a restarted one to show life
         
     def is_process_running(self, name):
-        """Check if process is running."""
-        result = subprocess.run(['pgrep', '-f', name], capture_output=True, text=True)
-        pids = [p for p in result.stdout.strip().split('\n') if p]
-        return pids
+        """Check if process is running (PIDs whose command line contains name)."""
+        scanned_at, procs = self._process_scan
+        now = time.monotonic()
+        if now - scanned_at > self.process_scan_ttl:
+            procs = _scan_processes()
+            self._process_scan = (now, procs)
+        return [str(pid) for pid, cmdline in procs if name in cmdline]
+    
+    def _wait_gone(self, name, timeout):
+        """Poll /proc until no command line contains name; False on timeout."""
+        deadline = time.monotonic() + timeout
+        while any(name in cmdline for _, cmdline in _scan_processes()):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        self._process_scan = (0.0, [])  # the cached scan may still list it
+        return True
+    
+    def _wait_started(self, name, timeout):
+        """Poll /proc until a command line contains name; False on timeout."""
+        deadline = time.monotonic() + timeout
+        while not any(name in cmdline for _, cmdline in _scan_processes()):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        self._process_scan = (0.0, [])
+        return True
+    
+    def _wait_status_update(self, since, timeout):
+        """Wait for the status file's mtime to pass since (epoch seconds).
+        
+        Sleeps on inotify where available and polls otherwise; False on timeout.
+        """
+        watch = _open_inotify({self.status_file.resolve().parent})
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    if self.status_file.stat().st_mtime > since:
+                        return True
+                except FileNotFoundError:
+                    pass
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                if watch is not None:
+                    fd, watches = watch
+                    if select.select([fd], [], [], remaining)[0]:
+                        _read_inotify(fd, watches)
+                else:
+                    time.sleep(min(0.05, remaining))
+        finally:
+            if watch is not None:
+                os.close(watch[0])
     
     def get_status_file_age(self):
         """Get age of status file in seconds."""
-        if not self.status_file.exists():
+        # The writer rewrites the file on every heartbeat, so its mtime is
+        # the freshness signal; no read or parse needed
+        try:
+            age = time.time() - self.status_file.stat().st_mtime
+        except FileNotFoundError:
             return None
+        if age <= self.stale_threshold:
+            return age
         
+        # mtime says stale; let the heartbeat timestamp inside have the final word
         try:
-            with open(self.status_file) as f:
-                data = json.load(f)
-            ts = data.get('timestamp', 0)
+            ts = _load_json_cached(self.status_file).get('timestamp', 0)
             if ts:
-                age = (datetime.now() - datetime.fromtimestamp(ts)).total_seconds()
-                return age
-        except:
+                return time.time() - ts
+        except Exception:
             pass
-        return None
+        return age
     
     def is_status_stale(self):
         """Check if status file is stale (not being updated)."""
@@ -59,28 +268,30 @@ class HealthMonitor:
     
     def check_ideas_stuck(self):
         """Check if ideas are stuck (in queue but not being processed for > threshold)."""
-        if not self.ideas_file.exists():
-            return False, None
-        
         try:
-            with open(self.ideas_file) as f:
-                ideas = json.load(f)
-            
-            if not ideas:
+            # Cheapest checks first: a stat for staleness and a peek at the
+            # queue's first bytes, so a healthy system never parses the queue
+            if not self.is_status_stale():
+                return False, None
+            pending = _count_json_lines(self.pending_ideas_file)
+            if not pending and (not self.ideas_file.exists() or _json_array_is_empty(self.ideas_file)):
                 return False, None
             
             # Get status
             status = {}
             if self.status_file.exists():
-                with open(self.status_file) as f:
-                    status = json.load(f)
+                status = _load_json_cached(self.status_file)
             
             active = sum(1 for w in status.get('workers', {}).values() 
                         if w.get('status') == 'working')
+            if active:
+                return False, None
             
             # If ideas exist but no workers active AND status is stale = stuck
-            if ideas and active == 0 and self.is_status_stale():
-                return True, f"{len(ideas)} ideas waiting, no active workers"
+            ideas = _load_json_cached(self.ideas_file) if self.ideas_file.exists() else []
+            waiting = len(ideas) + pending
+            if waiting:
+                return True, f"{waiting} ideas waiting, no active workers"
         except:
             pass
         
@@ -95,8 +306,7 @@ class HealthMonitor:
                 continue
             
             try:
-                with open(path) as f:
-                    data = json.load(f)
+                data = _load_json_cached(path)
                 if not isinstance(data, list):
                     issues.append(f"{path.name} is not a list")
             except json.JSONDecodeError:
@@ -107,26 +317,37 @@ class HealthMonitor:
         return issues
     
     def diagnose(self):
-        """Full system diagnostic."""
+        """Full system diagnostic, reusing a result younger than diagnose_ttl."""
+        if self._last_diag is not None and time.monotonic() - self._last_diag[0] < self.diagnose_ttl:
+            return self._last_diag[1]
+        result = self._diagnose()
+        self._last_diag = (time.monotonic(), result)
+        return result
+    
+    def _diagnose(self):
+        """Run and print every check."""
         print("\n" + "="*70)
         print("🏥 HEALTH MONITOR DIAGNOSTIC")
         print("="*70)
-        print(f"Timestamp: {datetime.now().strftime('%H:%M:%S')}")
+        print(f"Timestamp: {time.strftime('%H:%M:%S')}")
         print()
         
+        # Human-readable messages for the summary; `flags` is what callers act on
         issues = []
         warnings = []
+        flags = Issue(0)
         
         # 1. Process health
         print("1️⃣  PROCESS STATUS")
         print("-"*70)
-        for proc in ['worker2.py', 'retry_manager.py', 'outline']:
+        for proc, flag in _PROCESS_ISSUES.items():
             pids = self.is_process_running(proc)
             if pids:
                 print(f"✅ {proc:20s} PID: {pids[0].split()[0]}")
             else:
                 print(f"❌ {proc:20s} NOT RUNNING")
                 issues.append(f"{proc} not running")
+                flags |= flag
         print()
         
         # 2. Status file freshness
@@ -136,9 +357,11 @@ class HealthMonitor:
         if age is None:
             print("❌ Status file not found or unreadable")
             issues.append("Status file missing/unreadable")
+            flags |= Issue.STATUS_MISSING
         elif age > self.stale_threshold:
             print(f"❌ Status file STALE: {age:.0f}s old (threshold: {self.stale_threshold}s)")
             issues.append(f"Status file stale ({age:.0f}s)")
+            flags |= Issue.STATUS_STALE
         else:
             print(f"✅ Status file fresh: {age:.0f}s old")
         print()
@@ -146,22 +369,27 @@ class HealthMonitor:
         # 3. Ideas queue
         print("3️⃣  IDEAS QUEUE STATUS")
         print("-"*70)
+        pending = _count_json_lines(self.pending_ideas_file)
+        if pending:
+            print(f"ℹ️  ideas_log.jsonl: {pending} items not yet folded in by worker2")
+        waiting = pending
         if self.ideas_file.exists():
             try:
-                with open(self.ideas_file) as f:
-                    ideas = json.load(f)
+                ideas = _load_json_cached(self.ideas_file)
                 print(f"✅ ideas_log.json: {len(ideas)} items")
-                
-                if ideas:
-                    stuck, msg = self.check_ideas_stuck()
-                    if stuck:
-                        print(f"⚠️  STUCK: {msg}")
-                        warnings.append(msg)
+                waiting += len(ideas)
             except:
                 print("❌ ideas_log.json is corrupted")
                 issues.append("ideas_log.json corrupted")
+                flags |= Issue.IDEAS_CORRUPT
         else:
             print("⚠️  ideas_log.json not found")
+        if waiting:
+            stuck, msg = self.check_ideas_stuck()
+            if stuck:
+                print(f"⚠️  STUCK: {msg}")
+                warnings.append(msg)
+                flags |= Issue.IDEAS_STUCK
         print()
         
         # 4. Queue file integrity
@@ -172,6 +400,7 @@ class HealthMonitor:
             for issue in corruption_issues:
                 print(f"❌ {issue}")
                 issues.append(issue)
+            flags |= Issue.QUEUE_INVALID
         else:
             print("✅ All queue files valid")
         print()
@@ -181,12 +410,12 @@ class HealthMonitor:
         print("-"*70)
         if self.retry_file.exists():
             try:
-                with open(self.retry_file) as f:
-                    retry = json.load(f)
+                retry = _load_json_cached(self.retry_file)
                 print(f"✅ retry_queue.json: {len(retry)} projects")
             except:
                 print("❌ retry_queue.json is corrupted")
                 issues.append("retry_queue.json corrupted")
+                flags |= Issue.RETRY_CORRUPT
         print()
         
         # Summary
@@ -195,7 +424,7 @@ class HealthMonitor:
         print("="*70)
         if not issues and not warnings:
             print("✅ SYSTEM HEALTHY - All checks passed")
-            return True, []
+            return True, flags
         
         if warnings:
             print(f"⚠️  {len(warnings)} warning(s):")
@@ -206,9 +435,9 @@ class HealthMonitor:
             print(f"❌ {len(issues)} critical issue(s):")
             for issue in issues:
                 print(f"   - {issue}")
-            return False, issues
+            return False, flags
         
-        return True, warnings
+        return True, flags
     
     def auto_recover(self):
         """Attempt to auto-recover from detected issues."""
@@ -216,50 +445,61 @@ class HealthMonitor:
         print("🔧 AUTO-RECOVERY")
         print("="*70)
         
-        healthy, issues = self.diagnose()
+        healthy, flags = self.diagnose()
         
-        if healthy and not issues:
+        if healthy and not flags:
             print("✅ System is healthy, no recovery needed")
             return True
         
         recovered = []
         
         # 1. Restart stuck worker2
-        if any('Status file stale' in str(i) or 'STUCK' in str(i) for i in issues):
+        if flags & (Issue.STATUS_STALE | Issue.IDEAS_STUCK):
             print("\n🔄 Restarting worker2 (status stale/ideas stuck)...")
-            subprocess.run(['pkill', '-9', 'worker2.py'], capture_output=True)
-            time.sleep(2)
-            subprocess.Popen(['nohup', 'python3', '-u', 'worker2.py'], 
-                           stdout=open('worker2.log', 'a'),
-                           stderr=subprocess.STDOUT,
-                           cwd='/home/pi/Desktop/test/create')
-            time.sleep(3)
+            subprocess.run(['pkill', '-9', '-f', 'worker2.py'], capture_output=True)
+            self._wait_gone('worker2.py', self.kill_timeout)
+            started = time.time()
+            # The child keeps its own copy of the log fd; ours closes on exit
+            with open('worker2.log', 'a') as log:
+                subprocess.Popen(['nohup', 'python3', '-u', 'worker2.py'],
+                               stdout=log,
+                               stderr=subprocess.STDOUT,
+                               close_fds=True,
+                               cwd='/home/pi/Desktop/test/create')
+            self._wait_status_update(started, self.startup_timeout)
             recovered.append("worker2 restarted")
         
         # 2. Restart retry_manager if not running
-        if any('retry_manager' in str(i) for i in issues):
+        if flags & Issue.RETRY_DOWN:
             print("\n🔄 Restarting retry_manager...")
-            subprocess.run(['pkill', '-9', 'retry_manager.py'], capture_output=True)
-            time.sleep(1)
-            subprocess.Popen(['nohup', 'python3', '-u', 'retry_manager.py'],
-                           stdout=open('retry_manager.log', 'a'),
-                           stderr=subprocess.STDOUT,
-                           cwd='/home/pi/Desktop/test/create')
-            time.sleep(2)
+            subprocess.run(['pkill', '-9', '-f', 'retry_manager.py'], capture_output=True)
+            self._wait_gone('retry_manager.py', self.kill_timeout)
+            with open('retry_manager.log', 'a') as log:
+                subprocess.Popen(['nohup', 'python3', '-u', 'retry_manager.py'],
+                               stdout=log,
+                               stderr=subprocess.STDOUT,
+                               close_fds=True,
+                               cwd='/home/pi/Desktop/test/create')
+            # retry_manager writes no heartbeat, so seeing it in /proc is enough
+            self._wait_started('retry_manager.py', self.startup_timeout)
             recovered.append("retry_manager restarted")
         
         # 3. Fix corrupted files
-        if any('corrupted' in str(i).lower() for i in issues):
+        if flags & (Issue.IDEAS_CORRUPT | Issue.RETRY_CORRUPT):
             print("\n🔧 Fixing corrupted files...")
-            if 'ideas_log.json corrupted' in str(issues):
-                Path('ideas_log.json').write_text('[]')
+            if flags & Issue.IDEAS_CORRUPT:
+                _reset_json_array(Path('ideas_log.json'))
                 print("   ✓ Reset ideas_log.json")
                 recovered.append("ideas_log.json reset")
-            if 'retry_queue.json corrupted' in str(issues):
-                Path('implementation_outputs/retry_queue.json').write_text('[]')
+            if flags & Issue.RETRY_CORRUPT:
+                _reset_json_array(Path('implementation_outputs/retry_queue.json'))
                 print("   ✓ Reset retry_queue.json")
                 recovered.append("retry_queue.json reset")
         
+        # Restarts and resets change what the next diagnose() would see
+        if recovered:
+            self._last_diag = None
+        
         print()
         print("="*70)
         print(f"✅ RECOVERED FROM {len(recovered)} issue(s)")
@@ -276,18 +516,44 @@ class HealthMonitor:
         print(f"   Stale threshold: {self.stale_threshold}s")
         print()
         
-        cycle = 0
+        queue_files = {p.resolve() for p in (self.ideas_file, self.pending_ideas_file,
+                                             self.retry_file, self.qa_file)}
+        watch = _open_inotify({p.parent for p in queue_files | {self.status_file.resolve()}})
+        if watch is None:
+            print("   File watching unavailable, polling instead")
+            print()
+        
+        # Checks run every check_interval as when polling; with inotify a
+        # queue file rewrite brings the next check forward (after a 1 s
+        # settle so a burst of rewrites costs one check) but never delays it.
+        # Status heartbeats don't wake the loop
+        last_check = None
         while True:
-            cycle += 1
             try:
-                healthy, issues = self.diagnose()
+                if watch is not None and last_check is not None:
+                    fd, watches = watch
+                    deadline = last_check + self.check_interval
+                    while True:
+                        now = time.monotonic()
+                        if now >= deadline:
+                            break
+                        ready, _, _ = select.select([fd], [], [], deadline - now)
+                        if ready and _read_inotify(fd, watches) & queue_files:
+                            deadline = min(deadline, time.monotonic() + 1.0)
+                elif last_check is not None:
+                    time.sleep(self.check_interval)
+                
+                last_check = time.monotonic()
+                healthy, _ = self.diagnose()
                 
                 if not healthy:
                     print("\n⚠️  UNHEALTHY STATE DETECTED - Attempting recovery...")
                     self.auto_recover()
                 
-                print(f"\n⏰ Next check in {self.check_interval}s...")
-                time.sleep(self.check_interval)
+                if watch is None:
+                    print(f"\n⏰ Next check in {self.check_interval}s...")
+                else:
+                    print(f"\n⏰ Next check on queue change or in {self.check_interval}s...")
             except KeyboardInterrupt:
                 print("\n\n⏹️  Health monitor stopped")
                 sys.exit(0)
@@ -6,12 +6,83 @@ import queue
 import time
 import json
 import os
+import fcntl
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import random
+import socket
 import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 from datetime import datetime
 
+# orjson parses/serializes in native code; fall back to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# Lines that drive parse_idea: "Title:", "Description:", "Code:" headers and
+# ``` fences (which may be indented)
+_IDEA_LINE_RE = re.compile(r'^(?:(Title:|Description:|Code:)|[^\S\n]*```)(.*)$', re.M)
+
+
+def load_json(path):
+    """Parse a JSON file from its raw bytes."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+def append_json_line(path, obj):
+    """Append obj to a JSON-lines file as one durable record.
+    
+    The record goes out in a single write on an O_APPEND fd under an
+    exclusive flock (the lock worker2 takes to fold the file into
+    ideas_log.json) and is fsynced before returning. A power cut can only
+    cut off the last line, which readers skip; a new line is started if
+    the previous writer died mid-record.
+    """
+    line = (orjson.dumps(obj) if HAS_ORJSON else json.dumps(obj).encode()) + b'\n'
+    fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b'\n':
+            line = b'\n' + line
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)  # also drops the flock
+
+
+def load_json_lines(path):
+    """Records of a JSON-lines file, skipping blank and torn lines."""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return []
+    records = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(orjson.loads(line) if HAS_ORJSON else json.loads(line))
+        except ValueError:
+            pass
+    return records
+
+# Where a running `mk14.py --serve` receives ideas (see mk14.MK14_SOCKET)
+MK14_SOCKET = "/tmp/mk14.sock"
+
 class IdeaGeneratorApp:
+    LOG_MAX_LINES = 1000  # older log lines are dropped from the widget
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Background Code Idea Generator")
@@ -22,9 +93,28 @@ class IdeaGeneratorApp:
         self.idea_queue = queue.Queue()
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()  # wakes generation_loop's waits on stop
         self.mode = "Generate"
         self.loaded_ideas = []
-        self.web_ideas_used = []
+        self.web_ideas_used = set()  # GitHub repo ids already turned into ideas
+        self._web_ideas_order = deque(maxlen=500)  # same ids, oldest first, for eviction
+        self._log_buf = deque()  # lines waiting for the next idle flush
+        self._flush_pending = False
+        self._log_ts = (None, "")  # (epoch second, its "%H:%M:%S" text)
+        
+        # One pooled session for Ollama and GitHub so repeat calls skip the
+        # TCP/TLS handshake; requests already asks for gzip by default
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                              max_retries=Retry(total=2, backoff_factor=0.5))
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        self._http.headers.update({"User-Agent": "IdeaGen/1"})
+        self._model_pool = ThreadPoolExecutor(max_workers=len(self.models))
+        self._mk14_sock = None  # connected lazily to MK14_SOCKET
+        self._popup = None  # one hidden Toplevel, built on first use
+        self._current_idea = None  # idea the popup is showing
+        self._popup_pending = deque()  # ideas waiting for the popup
         
         # GUI Elements
         frame = ttk.Frame(root)
@@ -81,9 +171,11 @@ class IdeaGeneratorApp:
     def toggle_generation(self):
         if self.running:
             self.running = False
+            self._stop_event.set()
             self.status_label.config(text="Status: Stopping...")
             if self.thread:
-                self.thread.join(timeout=2)
+                self.thread.join(timeout=5)
+            self._stop_event.clear()
             self.start_stop_button.config(text="Start Generation")
             self.log("Generation stopped")
             self.status_label.config(text="Status: Stopped")
@@ -123,46 +215,62 @@ class IdeaGeneratorApp:
                         self.save_idea(idea)
                         self.log(f"Generated idea: {idea['title']}")
                 
-                time.sleep(300)  # 5 minutes between generations
+                if self._stop_event.wait(300):  # 5 minutes between generations
+                    break
             except Exception as e:
                 self.log(f"Error in generation loop: {str(e)}")
-                time.sleep(60)
+                if self._stop_event.wait(60):
+                    break
     
     def generate_idea(self):
         language = random.choice(self.languages)
         prompt = f"Generate a creative idea for a new {language} code project. Provide a title, a brief description, and a sample code snippet. Format as: Title: <title>\nDescription: <desc>\nCode:\n```{language.lower()}\n<code>\n```"
         
-        for model in self.models:
-            try:
-                response = requests.post(
-                    "http://localhost:11434/api/generate",
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "stream": False
-                    },
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    result = response.json().get('response', '')
-                    if result:
-                        idea = self.parse_idea(result, language)
-                        if idea:
-                            return idea
-            except requests.exceptions.Timeout:
-                self.log(f"⚠ Timeout for model {model}, trying next")
-            except requests.exceptions.ConnectionError:
-                self.log(f"⚠ Connection error for model {model}, trying next")
-            except Exception as e:
-                self.log(f"⚠ Error with model {model}: {str(e)}, trying next")
+        # Ask every model at once and keep the first usable answer, so a dead
+        # or slow model no longer delays the others by its full timeout
+        futures = [self._model_pool.submit(self._try_model, model, prompt, language)
+                   for model in self.models]
+        try:
+            for future in as_completed(futures, timeout=30):
+                idea = future.result()
+                if idea:
+                    return idea
+        except FuturesTimeout:
+            self.log("⚠ Timeout waiting for models")
+        finally:
+            for future in futures:
+                future.cancel()
         
         self.log("✗ Failed to generate idea from all models")
         return None
     
+    def _try_model(self, model, prompt, language):
+        try:
+            response = self._http.post(
+                "http://localhost:11434/api/generate",
+                json={
+                    "model": model,
+                    "prompt": prompt,
+                    "stream": False
+                },
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                result = response.json().get('response', '')
+                if result:
+                    return self.parse_idea(result, language)
+        except requests.exceptions.Timeout:
+            self.log(f"⚠ Timeout for model {model}")
+        except requests.exceptions.ConnectionError:
+            self.log(f"⚠ Connection error for model {model}")
+        except Exception as e:
+            self.log(f"⚠ Error with model {model}: {str(e)}")
+        return None
+    
     def fetch_web_idea(self):
         try:
-            response = requests.get(
+            response = self._http.get(
                 "https://api.github.com/search/repositories?q=language:python&sort=stars&order=desc&per_page=20",
                 timeout=10
             )
@@ -173,11 +281,15 @@ class IdeaGeneratorApp:
                     # Get a random repo that hasn't been used
                     available_repos = [r for r in repos if r['id'] not in self.web_ideas_used]
                     if not available_repos:
-                        self.web_ideas_used = []
+                        self.web_ideas_used.clear()
+                        self._web_ideas_order.clear()
                         available_repos = repos
                     
                     repo = random.choice(available_repos)
-                    self.web_ideas_used.append(repo['id'])
+                    if len(self._web_ideas_order) == self._web_ideas_order.maxlen:
+                        self.web_ideas_used.discard(self._web_ideas_order[0])
+                    self.web_ideas_used.add(repo['id'])
+                    self._web_ideas_order.append(repo['id'])
                     
                     title = repo['name']
                     description = repo['description'] or "A trending GitHub repository."
@@ -202,27 +314,36 @@ class IdeaGeneratorApp:
         return None
     
     def parse_idea(self, response, language):
-        lines = response.split('\n')
         title = ""
         description = ""
-        code = ""
+        code_parts = []
         in_code = False
         backtick_count = 0
+        code_from = 0  # start of the plain lines not yet added to the code
         
-        for line in lines:
-            if line.startswith("Title:"):
-                title = line[6:].strip()
-            elif line.startswith("Description:"):
-                description = line[12:].strip()
-            elif line.startswith("Code:"):
+        # Only header and fence lines change state, so jump between those;
+        # the plain lines in between are taken as whole slices
+        for m in _IDEA_LINE_RE.finditer(response):
+            key = m.group(1)
+            if key is None and not in_code:
+                continue  # a fence before "Code:" is just text
+            if in_code:
+                code_parts.append(response[code_from:m.start()])
+            code_from = m.end() + 1
+            if key == "Title:":
+                title = m.group(2).strip()
+            elif key == "Description:":
+                description = m.group(2).strip()
+            elif key == "Code:":
                 in_code = True
-            elif in_code:
-                if line.strip().startswith("```"):
-                    backtick_count += 1
-                    if backtick_count == 2:
-                        break
-                else:
-                    code += line + '\n'
+            else:
+                backtick_count += 1
+                if backtick_count == 2:
+                    break
+        else:
+            if in_code and code_from <= len(response):
+                code_parts.append(response[code_from:] + '\n')
+        code = ''.join(code_parts)
         
         if title and (description or code):
             return {
@@ -236,27 +357,24 @@ class IdeaGeneratorApp:
         return None
     
     def save_idea(self, idea):
-        ideas_file = os.path.join(os.path.dirname(__file__), "ideas_log.json")
+        # One appended line per idea; worker2 folds ideas_log.jsonl into the
+        # ideas_log.json queue, so the queue isn't rewritten for every idea
+        pending_file = os.path.join(os.path.dirname(__file__), "ideas_log.jsonl")
         try:
-            if os.path.exists(ideas_file) and os.path.getsize(ideas_file) > 0:
-                with open(ideas_file, 'r') as f:
-                    ideas = json.load(f)
-            else:
-                ideas = []
-            
-            ideas.append(idea)
-            
-            with open(ideas_file, 'w') as f:
-                json.dump(ideas, f, indent=4)
+            append_json_line(pending_file, idea)
         except Exception as e:
             self.log(f"⚠ Error saving idea: {str(e)}")
     
     def load_ideas_log(self):
         ideas_file = os.path.join(os.path.dirname(__file__), "ideas_log.json")
+        pending_file = os.path.join(os.path.dirname(__file__), "ideas_log.jsonl")
         try:
+            ideas = []
             if os.path.exists(ideas_file) and os.path.getsize(ideas_file) > 0:
-                with open(ideas_file, 'r') as f:
-                    ideas = json.load(f)
+                ideas = load_json(ideas_file)
+            # Ideas not yet folded into the queue by worker2
+            ideas += load_json_lines(pending_file)
+            if ideas:
                 self.log(f"Loaded {len(ideas)} ideas from history (showing last 5)")
                 for idea in ideas[-5:]:
                     timestamp = datetime.fromtimestamp(idea['timestamp']).strftime("%Y-%m-%d %H:%M:%S")
@@ -284,20 +402,20 @@ class IdeaGeneratorApp:
             return
         
         try:
-            with open(file_path, 'r') as f:
-                if file_path.endswith('.json'):
-                    self.loaded_ideas = json.load(f)
-                    if not isinstance(self.loaded_ideas, list):
-                        self.loaded_ideas = [self.loaded_ideas]
-                else:
+            if file_path.endswith('.json'):
+                self.loaded_ideas = load_json(file_path)
+                if not isinstance(self.loaded_ideas, list):
+                    self.loaded_ideas = [self.loaded_ideas]
+            else:
+                with open(file_path, 'r') as f:
                     content = f.read()
-                    blocks = content.split('---')
-                    self.loaded_ideas = []
-                    for block in blocks:
-                        if block.strip():
-                            idea = self.parse_idea(block.strip(), "Python")
-                            if idea:
-                                self.loaded_ideas.append(idea)
+                blocks = content.split('---')
+                self.loaded_ideas = []
+                for block in blocks:
+                    if block.strip():
+                        idea = self.parse_idea(block.strip(), "Python")
+                        if idea:
+                            self.loaded_ideas.append(idea)
             
             for idea in self.loaded_ideas:
                 if 'language' not in idea:
@@ -309,26 +427,50 @@ class IdeaGeneratorApp:
             self.log(f"✗ Failed to load file: {str(e)}")
     
     def show_popup(self, idea):
+        # Building a Toplevel per idea is the slow part, so one popup is
+        # built once, then refilled and shown again; ideas that arrive while
+        # it is up wait their turn
+        if self._popup is None:
+            self._build_popup_template()
+        if self._current_idea is not None:
+            self._popup_pending.append(idea)
+            return
+        self._current_idea = idea
+        
+        w = self._popup_widgets
+        w['title'].config(text=f"Title: {idea['title']}")
+        meta_text = f"Language: {idea.get('language', 'Python')}"
+        if 'source' in idea:
+            meta_text += f" | Source: {idea['source']}"
+        w['meta'].config(text=meta_text)
+        w['desc'].config(text=f"Description: {idea['description']}")
+        code_text = w['code']
+        code_text.config(state=tk.NORMAL)
+        code_text.delete('1.0', tk.END)
+        code_text.insert(tk.END, idea['code'])
+        code_text.config(state=tk.DISABLED)
+        
+        self._popup.deiconify()
+        self._popup.lift()
+    
+    def _build_popup_template(self):
         popup = tk.Toplevel(self.root)
+        popup.withdraw()
         popup.title("New Code Idea!")
         popup.geometry("600x500")
-        popup.attributes('-topmost', True)
+        popup.wm_attributes('-topmost', True)
+        popup.protocol("WM_DELETE_WINDOW", self._dismiss_popup)
         
         # Title
-        title_label = ttk.Label(popup, text=f"Title: {idea['title']}", 
-                               font=("Arial", 12, "bold"))
+        title_label = ttk.Label(popup, font=("Arial", 12, "bold"))
         title_label.pack(pady=5)
         
         # Language and metadata
-        meta_text = f"Language: {idea.get('language', 'Python')}"
-        if 'source' in idea:
-            meta_text += f" | Source: {idea['source']}"
-        meta_label = ttk.Label(popup, text=meta_text, font=("Arial", 10))
+        meta_label = ttk.Label(popup, font=("Arial", 10))
         meta_label.pack(pady=2)
         
         # Description
-        desc_label = ttk.Label(popup, text=f"Description: {idea['description']}", 
-                              wraplength=550, justify=tk.LEFT)
+        desc_label = ttk.Label(popup, wraplength=550, justify=tk.LEFT)
         desc_label.pack(pady=5, padx=10, fill=tk.X)
         
         # Code display
@@ -338,7 +480,6 @@ class IdeaGeneratorApp:
         ttk.Label(code_frame, text="Sample Code:").pack(anchor=tk.W)
         
         code_text = scrolledtext.ScrolledText(code_frame, height=12, width=70)
-        code_text.insert(tk.END, idea['code'])
         code_text.config(state=tk.DISABLED)
         code_text.pack(fill=tk.BOTH, expand=True)
         
@@ -346,57 +487,65 @@ class IdeaGeneratorApp:
         button_frame = ttk.Frame(popup)
         button_frame.pack(pady=10, fill=tk.X, padx=10)
         
-        def save_code():
-            lang = idea.get('language', 'Python')
-            ext_map = {
-                "Python": ".py",
-                "JavaScript": ".js",
-                "Java": ".java",
-                "C++": ".cpp",
-                "C#": ".cs",
-                "Go": ".go",
-                "Rust": ".rs"
-            }
-            ext = ext_map.get(lang, ".txt")
-            filename = f"{idea['title'].replace(' ', '_')}{ext}"
-            filepath = os.path.join(os.path.dirname(__file__), filename)
-            
-            try:
-                with open(filepath, 'w') as f:
-                    f.write(idea['code'])
-                messagebox.showinfo("Saved", f"Code saved to {filename}")
-                self.log(f"✓ Code saved: {filename}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save: {str(e)}")
-                self.log(f"✗ Failed to save code: {str(e)}")
-            
-            popup.destroy()
+        ttk.Button(button_frame, text="Save Code", command=self._save_popup_code).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Pass to mk14", command=self._pass_popup_to_mk14).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Dismiss", command=self._dismiss_popup).pack(side=tk.RIGHT, padx=5)
         
-        def pass_to_mk14():
-            if self._has_mk14():
-                try:
-                    self.log(f"→ Passing idea to mk14: {idea['title']}")
-                    # mk14 implementation will be added later
-                    subprocess.Popen(["python3", "mk14.py", json.dumps(idea)])
-                    messagebox.showinfo("Success", "Idea passed to mk14 for implementation")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to pass to mk14: {str(e)}")
-                    self.log(f"✗ Failed to pass to mk14: {str(e)}")
-            else:
-                messagebox.showinfo("Info", "mk14 program not available yet")
-            
-            popup.destroy()
+        # Make it non-modal; no grab is ever set, so none needs releasing
+        popup.transient(self.root)
         
-        def dismiss():
-            popup.destroy()
+        self._popup = popup
+        self._popup_widgets = {'title': title_label, 'meta': meta_label,
+                               'desc': desc_label, 'code': code_text}
+    
+    def _save_popup_code(self):
+        idea = self._current_idea
+        lang = idea.get('language', 'Python')
+        ext_map = {
+            "Python": ".py",
+            "JavaScript": ".js",
+            "Java": ".java",
+            "C++": ".cpp",
+            "C#": ".cs",
+            "Go": ".go",
+            "Rust": ".rs"
+        }
+        ext = ext_map.get(lang, ".txt")
+        filename = f"{idea['title'].replace(' ', '_')}{ext}"
+        filepath = os.path.join(os.path.dirname(__file__), filename)
         
-        ttk.Button(button_frame, text="Save Code", command=save_code).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Pass to mk14", command=pass_to_mk14).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Dismiss", command=dismiss).pack(side=tk.RIGHT, padx=5)
+        try:
+            with open(filepath, 'w') as f:
+                f.write(idea['code'])
+            messagebox.showinfo("Saved", f"Code saved to {filename}")
+            self.log(f"✓ Code saved: {filename}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save: {str(e)}")
+            self.log(f"✗ Failed to save code: {str(e)}")
         
-        # Make it non-modal
-        popup.transient(self.root)
-        popup.grab_release()
+        self._dismiss_popup()
+    
+    def _pass_popup_to_mk14(self):
+        idea = self._current_idea
+        if self._has_mk14():
+            try:
+                self.log(f"→ Passing idea to mk14: {idea['title']}")
+                self._launch_mk14(idea)
+                messagebox.showinfo("Success", "Idea passed to mk14 for implementation")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to pass to mk14: {str(e)}")
+                self.log(f"✗ Failed to pass to mk14: {str(e)}")
+        else:
+            messagebox.showinfo("Info", "mk14 program not available yet")
+        
+        self._dismiss_popup()
+    
+    def _dismiss_popup(self):
+        # Hide rather than destroy so the next idea reuses the same widgets
+        self._popup.withdraw()
+        self._current_idea = None
+        if self._popup_pending:
+            self.show_popup(self._popup_pending.popleft())
     
     def _has_mk14(self):
         return os.path.exists(os.path.join(os.path.dirname(__file__), "mk14.py"))
@@ -405,21 +554,67 @@ class IdeaGeneratorApp:
         if self._has_mk14() and idea.get('source') == 'github':
             try:
                 self.log(f"→ Attempting to pass web idea to mk14: {idea['title']}")
-                subprocess.Popen(["python3", "mk14.py", json.dumps(idea)])
+                self._launch_mk14(idea)
             except Exception as e:
                 self.log(f"⚠ Could not pass to mk14: {str(e)}")
     
+    def _launch_mk14(self, idea):
+        """Hand idea to a running mk14 daemon, or start mk14 for it if none is up."""
+        payload = json.dumps(idea)
+        try:
+            if self._mk14_sock is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                try:
+                    sock.connect(MK14_SOCKET)
+                except OSError:
+                    sock.close()
+                    raise
+                self._mk14_sock = sock
+            self._mk14_sock.send(payload.encode())
+            return
+        except OSError:
+            # No daemon (or it restarted, or the idea is too big for one
+            # datagram): drop the socket and fall back to a new process
+            if self._mk14_sock is not None:
+                self._mk14_sock.close()
+                self._mk14_sock = None
+        subprocess.Popen(["python3", "mk14.py", payload])
+    
     def log(self, message):
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        # Messages within the same second share one formatted timestamp
+        now = time.time()
+        second = int(now)
+        if second != self._log_ts[0]:
+            self._log_ts = (second, time.strftime("%H:%M:%S", time.localtime(now)))
+        timestamp = self._log_ts[1]
         log_message = f"[{timestamp}] {message}"
-        self.log_text.insert(tk.END, log_message + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.update()
+        self._log_buf.append(log_message + "\n")
+        # One insert per idle cycle, however many lines arrived meanwhile
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.root.after_idle(self._flush_log)
+    
+    def _flush_log(self):
+        self._flush_pending = False
+        lines = []
+        while self._log_buf:
+            lines.append(self._log_buf.popleft())
+        if lines:
+            self.log_text.insert(tk.END, ''.join(lines))
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > self.LOG_MAX_LINES:
+                self.log_text.delete('1.0', f'{line_count - self.LOG_MAX_LINES}.0')
+            self.log_text.see(tk.END)
     
     def on_closing(self):
         self.running = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join(timeout=2)
+        self._model_pool.shutdown(wait=False, cancel_futures=True)
+        if self._mk14_sock is not None:
+            self._mk14_sock.close()
+        self._http.close()
         self.root.destroy()
 
 def main():
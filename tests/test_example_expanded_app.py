@@ -0,0 +1,97 @@
+"""Results of EXAMPLE_EXPANDED_GENERATED_APP's NumPy and orjson fast paths."""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import EXAMPLE_EXPANDED_GENERATED_APP as app
+
+
+def test_export_large_integer():
+    data = [{"a": 10**20}, {"a": 1}]
+    out = app.DataProcessor(data).export()
+    assert out == json.dumps(data, indent=2)
+    assert json.loads(out)[0]["a"] == 10**20
+
+
+def test_export_nan_and_inf():
+    data = [{"a": float("nan")}, {"a": float("inf")}]
+    out = app.DataExporter(data).to_json()
+    if app.orjson is None:
+        assert out == json.dumps(data, indent=2)
+    else:
+        # orjson writes strict JSON, which has no NaN or Infinity
+        assert json.loads(out) == [{"a": None}, {"a": None}]
+
+
+def test_export_non_ascii_text():
+    data = [{"a": "\u00e9", "b": "line\u2028sep", "c\u00e9": 1}]
+    out = app.DataProcessor(data).export()
+    assert json.loads(out) == data
+    if app.orjson is not None:
+        assert "\u00e9" in out  # UTF-8, not a \\u00e9 escape
+
+
+def test_export_exponent_floats():
+    data = [{"a": 1e16, "b": 1e-7, "c": 1e-5, "d": -1.5e300, "e": 5e-324}]
+    out = app.DataExporter(data).to_json()
+    assert json.loads(out) == data
+
+
+def test_to_json_bytes_falls_back_for_file_and_bytes():
+    data = [{"a": -(10**20), "b": float("nan")}]
+    expected = json.dumps(data, indent=2).encode()
+    assert app.DataExporter(data).to_json_bytes() == expected
+    fp = io.BytesIO()
+    assert app.DataExporter(data).to_json_bytes(fp) is None
+    assert fp.getvalue() == expected
+
+
+def test_to_json_bytes_non_ascii_and_exponent_floats():
+    data = [{"a": "\u00e9\u2028", "b": 1e16, "c": 1e-7}]
+    out = app.DataExporter(data).to_json_bytes()
+    assert json.loads(out) == data
+    assert out == app.DataExporter(data).to_json().encode()
+    fp = io.BytesIO()
+    assert app.DataExporter(data).to_json_bytes(fp) is None
+    assert fp.getvalue() == out
+
+
+def test_to_json_bytes_without_orjson(monkeypatch):
+    monkeypatch.setattr(app, "orjson", None)
+    data = [{"a": "\u00e9\u2028", "b": 1e16, "c": float("nan")}]
+    expected = json.dumps(data, indent=2).encode()
+    assert app.DataExporter(data).to_json_bytes() == expected
+    fp = io.BytesIO()
+    app.DataExporter(data).to_json_bytes(fp)
+    assert fp.getvalue() == expected
+
+
+def test_in_range_payload_unchanged():
+    data = [{"a": 2**63 - 1, "b": 1.5, "c": [1, "x", None]}]
+    assert json.loads(app.DataExporter(data).to_json()) == data
+
+
+def test_int_columns_above_2_53_stay_distinct():
+    base = 2**53
+    data = [{"a": base}, {"a": base + 1}, {"a": base + 3}]
+    processor = app.DataProcessor(data)
+    assert processor.filter.filter_by_key_value("a", base + 1) == [data[1]]
+    assert processor.filter.filter_by_range("a", base + 1, base + 1) == [data[1]]
+    assert processor.sorter.sort_by_key("a", reverse=True) == data[::-1]
+
+
+def test_int_beyond_int64_kept_as_object():
+    data = [{"a": 10**400}, {"a": 1}]
+    processor = app.DataProcessor(data)
+    assert processor.filter.filter_by_key_value("a", 10**400) == [data[0]]
+    assert processor.filter.filter_by_range("a", 0, 5) == [data[1]]
+    assert json.loads(processor.export()) == data
+
+
+def test_csv_writes_none_as_text():
+    data = [{"a": None, "b": 1.5, "c": True}, {"a": "x,y", "b": 2}]
+    assert app.DataExporter(data).to_csv_string() == 'a,b,c\nNone,1.5,True\n"x,y",2,'
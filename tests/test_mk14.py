@@ -0,0 +1,49 @@
+"""CodeImplementer._test_many runs snippets concurrently, results in order."""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mk14
+
+
+@pytest.fixture
+def implementer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return mk14.CodeImplementer({
+        'title': 'Order Check',
+        'code': 'print("hi")',
+        'output_dir': str(tmp_path / 'implementations'),
+    })
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node not installed")
+def test_test_many_keeps_input_order_across_languages(implementer):
+    snippets = [
+        ('print("ok")', 'Python'),
+        ('process.exit(3);', 'JavaScript'),
+        ('console.log("ok");', 'JavaScript'),
+        ('raise SystemExit(2)', 'Python'),
+        ('import sys\nsys.stdout.write("ok")', 'python'),
+    ]
+    results = implementer._test_many(snippets)
+    assert [success for success, _ in results] == [True, False, True, False, True]
+    assert results[1][1]['type'] == 'runtime'
+    assert results[3][1]['type'] == 'runtime'
+
+
+def test_test_many_empty(implementer):
+    assert implementer._test_many([]) == []
+
+
+def test_test_code_reuses_test_many_outcome(implementer, monkeypatch):
+    code = 'print("ok")'
+    implementer._test_results[code] = (True, None)
+    monkeypatch.setattr(implementer, '_compile_and_run_code',
+                        lambda *args: pytest.fail("tested twice"))
+    assert implementer._test_code(code, implementer.project_dir) is True
+    assert code not in implementer._test_results
@@ -36,6 +36,7 @@ OUTPUT_PROJECT_DIR = "./implementation_outputs"  # where mk14 writes temp projec
 RAM_THRESHOLD_MB = 16000              # optional: max RAM before pausing queue
 CHECK_RAM_INTERVAL = 1                # seconds
 IDEAS_LOG_PATH = Path(__file__).with_name("ideas_log.json")
+IDEAS_PENDING_PATH = Path(__file__).with_name("ideas_log.jsonl")  # idea_generator appends here
 QA_ISSUE_PATH = Path(__file__).with_name("QAissue.json")
 INCOMPLETE_CODE_LOG = Path(__file__).with_name("incomplete_code_log.json")  # log broken code for fixing
 IDLE_GRACE_SECONDS = 10               # seconds to wait after queue is empty before shutting down
@@ -65,7 +66,7 @@ IDEAS_LOG_LAST_MTIME = 0             # track file modification time for polling
 QA_ISSUE_LAST_MTIME = 0              # track file modification time for polling
 
 # Escalating retry system initialization
-LEARNING_DB = LearningFixDatabase() if HAS_ESCALATION else None  # track learned fixes
+LEARNING_DB = LearningFixDatabase.instance() if HAS_ESCALATION else None  # track learned fixes
 
 # Model health + prioritization
 MODEL_PORTS = {
@@ -212,6 +213,46 @@ def _read_json_locked(path: Path, default=None):
         return default if default is not None else []
 
 
+def _fold_pending_ideas():
+    """Move ideas appended to ideas_log.jsonl into ideas_log.json.
+
+    Holds the jsonl's flock (idea_generator's append lock) across the merge
+    and the truncate, so no append lands in between and is lost. Ideas
+    already in ideas_log.json (same title and timestamp) are skipped, so a
+    crash after the merge but before the truncate only replays the file.
+    Callers in the event loop must hold IDEA_LOG_LOCK. Returns the number
+    of ideas added.
+    """
+    try:
+        f = open(IDEAS_PENDING_PATH, "r+b")
+    except FileNotFoundError:
+        return 0
+    with f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        raw = f.read()
+        if not raw.strip():
+            return 0
+        pending = []
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                pending.append(json.loads(line))
+            except ValueError:
+                tqdm.write(f"⚠️ Skipping torn line in {IDEAS_PENDING_PATH.name}")
+        current = _read_json_locked(IDEAS_LOG_PATH, [])
+        if not isinstance(current, list):
+            return 0  # leave the pending ideas for after the queue is repaired
+        seen = {(i.get("title"), i.get("timestamp")) for i in current if isinstance(i, dict)}
+        new_items = [i for i in pending
+                     if isinstance(i, dict) and (i.get("title"), i.get("timestamp")) not in seen]
+        if new_items:
+            _write_atomic_json(IDEAS_LOG_PATH, current + new_items)
+        f.truncate(0)
+        os.fsync(f.fileno())
+        return len(new_items)
+
+
 async def _atomic_update_json(path: Path, lock: asyncio.Lock, update_fn):
     """Threaded atomic update of a JSON file guarded by an asyncio lock."""
     async with lock:
@@ -782,13 +823,17 @@ async def poll_ideas_log_changes():
     while True:
         try:
             await asyncio.sleep(poll_interval)
-            if not IDEAS_LOG_PATH.exists():
+            try:
+                has_pending = IDEAS_PENDING_PATH.stat().st_size > 0
+            except OSError:
+                has_pending = False
+            if not has_pending and not IDEAS_LOG_PATH.exists():
                 continue
             
             # Check if file was modified (new ideas appended)
             try:
-                current_mtime = IDEAS_LOG_PATH.stat().st_mtime
-                if current_mtime != IDEAS_LOG_LAST_MTIME:
+                current_mtime = IDEAS_LOG_PATH.stat().st_mtime if IDEAS_LOG_PATH.exists() else None
+                if has_pending or current_mtime != IDEAS_LOG_LAST_MTIME:
                     # File changed, reload it
                     await process_new_ideas_from_log()
                     IDEAS_LOG_LAST_MTIME = current_mtime
@@ -901,6 +946,7 @@ async def process_new_ideas_from_log():
     global IDEAS_LOG_LAST_SIZE
     try:
         async with IDEA_LOG_LOCK:
+            await asyncio.to_thread(_fold_pending_ideas)
             if not IDEAS_LOG_PATH.exists():
                 return
             ideas = await asyncio.to_thread(_read_json_locked, IDEAS_LOG_PATH, [])
@@ -1153,7 +1199,9 @@ async def run_workers():
             except Exception as e:
                 tqdm.write(f"❌ Failed to load {filename}: {e}")
 
-    # Load tasks from ideas_log.json
+    # Load tasks from ideas_log.json, after taking in any ideas appended to
+    # ideas_log.jsonl while worker2 was down
+    _fold_pending_ideas()
     ideas_from_log = load_ideas_from_log()
     if ideas_from_log:
         ideas.extend(ideas_from_log)
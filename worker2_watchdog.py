@@ -18,6 +18,7 @@ from pathlib import Path
 
 WORKER_STATUS_FILE = Path('worker2_status.json')
 IDEAS_LOG_FILE = Path('ideas_log.json')
+IDEAS_PENDING_FILE = Path('ideas_log.jsonl')  # appended ideas worker2 hasn't folded in
 CHECK_INTERVAL = 30  # Check every 30 seconds
 IDLE_THRESHOLD = 120  # Restart if all workers idle for 2 minutes with queue full
 
@@ -45,16 +46,23 @@ def get_worker_status():
         return None
 
 def get_ideas_count():
-    """Count ideas in ideas_log.json"""
+    """Count ideas in ideas_log.json plus those waiting in ideas_log.jsonl"""
+    count = 0
+    try:
+        with open(IDEAS_PENDING_FILE, 'rb') as f:
+            count = sum(1 for line in f if line.strip())
+    except OSError:
+        pass
+    
     if not IDEAS_LOG_FILE.exists():
-        return 0
+        return count
     
     try:
         with open(IDEAS_LOG_FILE) as f:
             ideas = json.load(f)
-            return len(ideas) if isinstance(ideas, list) else 0
+            return count + (len(ideas) if isinstance(ideas, list) else 0)
     except:
-        return 0
+        return count
 
 def restart_worker():
     """Restart worker2"""